@@ -1,22 +1,131 @@
 # extended_search.py
 
-def search_multiple_values(arr, targets):
+# インデックスの構築にかかるコスト（配列の走査1回分を 1 とした目安）
+# 辞書への登録は `in` による走査より数倍遅いため、走査およそ数回分とする
+INDEX_BUILD_COST_FACTOR = 4
+
+class ValueIndex:
+    """
+    配列から一度だけ構築し、複数回の探索で再利用できるハッシュインデックス
+    
+    値 → 最初に出現したインデックス の辞書を保持するため、
+    1回の探索は O(1)（構築は O(n)）になります。
+    元の配列の長さが構築時と変わった場合は古いインデックスとみなし、次回の探索時に自動的に再構築します。
+    同じ長さのまま要素を書き換えた場合は検出できないため、invalidate() を呼んでください。
+    別の配列を対象にする場合は rebind() を使います（インデックスは無効化されます）。
+    """
+    
+    def __init__(self, arr):
+        self._arr = arr
+        self._positions = None
+        self._built_length = -1
+    
+    def build(self):
+        """インデックスを（再）構築する - O(n)"""
+        positions = {}
+        for i, value in enumerate(self._arr):
+            # 最初に出現したインデックスだけを保持する
+            if value not in positions:
+                positions[value] = i
+        self._positions = positions
+        self._built_length = len(self._arr)
+        return self
+    
+    def invalidate(self):
+        """インデックスを無効化する（次回の探索時に再構築される）"""
+        self._positions = None
+        self._built_length = -1
+    
+    def rebind(self, arr):
+        """別の配列を対象にする（インデックスは無効化される）"""
+        self._arr = arr
+        self.invalidate()
+    
+    def is_stale(self):
+        """インデックスが元の配列と一致していない可能性があるかどうか"""
+        return self._positions is None or self._built_length != len(self._arr)
+    
+    def _ensure_built(self):
+        if self.is_stale():
+            self.build()
+        return self._positions
+    
+    def index_of(self, target):
+        """
+        値が最初に出現するインデックスを返す
+        
+        Returns:
+            int: 見つかった場合はそのインデックス、見つからなかった場合は-1
+        """
+        return self._ensure_built().get(target, -1)
+    
+    def contains(self, target):
+        """値が配列内に存在するかどうかを返す"""
+        return target in self._ensure_built()
+    
+    def __contains__(self, target):
+        return self.contains(target)
+    
+    def __len__(self):
+        """インデックスに登録されている異なる値の数"""
+        return len(self._ensure_built())
+
+def search_multiple_values(arr, targets, index=None):
     """
     複数の値（リスト）を受け取り、それぞれが元のリスト内に存在するかどうかを調べる関数
     
     Parameters:
         arr (list): 探索対象の配列
         targets (list): 探索する値のリスト
+        index (ValueIndex): arr から構築したインデックス（省略時は線形探索）
     
     Returns:
         dict: キーが探索値、値が存在するかどうかのブール値の辞書
     """
     result = {}
+    if index is not None:
+        # インデックスを使う場合: 1回の探索が O(1)、全体で O(k)
+        for target in targets:
+            result[target] = index.contains(target)
+        return result
+    
+    # インデックスなしの場合: 1回の探索が O(n)、全体で O(n·k)
     for target in targets:
         result[target] = target in arr
     
     return result
 
+def search_multiple_values_batch(arr, targets, index=None):
+    """
+    配列のサイズ n と探索値の数 k から、インデックス探索と線形探索のどちらを使うかを選ぶ関数
+    
+    - インデックス: 構築 O(n)（走査 INDEX_BUILD_COST_FACTOR 回分）+ 探索 O(k)
+    - 線形探索: O(n·k)
+    k·n が INDEX_BUILD_COST_FACTOR·n + k を超える場合はインデックス、それ以外は線形探索を使います。
+    既存のインデックスが渡された場合は常にそれを再利用します。
+    要素がハッシュできない場合は線形探索にフォールバックします。
+    
+    Parameters:
+        arr (list): 探索対象の配列
+        targets (iterable): 探索する値（リストのほか、ジェネレータなど1回しか読めないものも可）
+        index (ValueIndex): 再利用するインデックス（省略可）
+    
+    Returns:
+        dict: キーが探索値、値が存在するかどうかのブール値の辞書
+    """
+    # k を数えるために一度だけリストにする（ジェネレータは len を持たず、2回は読めないため）
+    targets = list(targets)
+    n = len(arr)
+    k = len(targets)
+    if index is None and n > 0 and k * n > INDEX_BUILD_COST_FACTOR * n + k:
+        try:
+            index = ValueIndex(arr).build()
+        except TypeError:
+            # リストなどハッシュできない要素が含まれる場合
+            index = None
+    
+    return search_multiple_values(arr, targets, index)
+
 def find_max_value(arr):
     """
     リスト内の最大値を線形探索で見つける関数
@@ -55,6 +164,24 @@ def extended_search_demo():
         status = "存在します" if exists else "存在しません"
         print(f"値 {target} はリスト内に {status}")
     
+    # インデックスを使った複数の値の検索
+    index = ValueIndex(numbers)
+    print("\n--- インデックスを使った検索結果 ---")
+    for target, exists in search_multiple_values(numbers, targets, index).items():
+        status = "存在します" if exists else "存在しません"
+        print(f"値 {target} はリスト内に {status}（インデックス: {index.index_of(target)}）")
+    
+    # 元のリストが変わると、インデックスは次回の探索時に再構築される
+    numbers.append(50)
+    print(f"値 50 を追加後: インデックス {index.index_of(50)} で見つかりました")
+    numbers.pop()
+    
+    # 同じ長さの別の配列に差し替える場合は rebind() で無効化し、次回の探索時に再構築する
+    shifted = [value + 1 for value in numbers]
+    index.rebind(shifted)
+    print(f"各要素に 1 を加えた配列に差し替え後: 値 {shifted[0]} はインデックス {index.index_of(shifted[0])}")
+    index.rebind(numbers)
+    
     # 最大値の検索
     max_value, max_index = find_max_value(numbers)
     
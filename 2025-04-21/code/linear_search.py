@@ -35,6 +35,32 @@ def linear_search_all(arr, target):
     
     return found_indices
 
+def iter_linear_search_all(iterable, target, limit=None):
+    """
+    線形探索アルゴリズム（すべての一致を検出・ジェネレータ版）
+    
+    リストを作らずに、一致したインデックスを見つけた順にすぐ返します。
+    ファイルやソケットから読み込むイテラブルなど、長さが分からない入力にも使えます。
+    
+    Parameters:
+        iterable: 探索対象の要素を順に返すイテラブル
+        target: 探索する値
+        limit (int): 返す一致の最大数（省略時はすべて）。達した時点で探索を打ち切る
+    
+    Yields:
+        int: 一致した要素のインデックス
+    """
+    if limit is not None and limit <= 0:
+        return
+    
+    found = 0
+    for i, value in enumerate(iterable):
+        if value == target:
+            yield i
+            found += 1
+            if found == limit:
+                return  # 上位 limit 件が見つかったら残りは読まない
+
 def linear_search_demo():
     # テスト用のデータセット
     numbers = [10, 25, 3, 14, 42, 19, 7, 36]
@@ -79,6 +105,16 @@ def linear_search_demo():
         print(f"値 {target} は以下のインデックスで見つかりました: {all_results}")
     else:
         print(f"値 {target} は配列内に存在しません。")
+    
+    # iter_linear_search_all のデモ
+    print("\n--- iter_linear_search_all のデモ ---")
+    target = 10
+    for index in iter_linear_search_all(iter(numbers_with_duplicates), target):
+        print(f"値 {target} をインデックス {index} で見つけました")
+    
+    # 最初の2件だけで探索を打ち切る
+    first_two = list(iter_linear_search_all(numbers_with_duplicates, target, limit=2))
+    print(f"最初の2件: {first_two}")
 
 if __name__ == "__main__":
     linear_search_demo()
@@ -0,0 +1,202 @@
+# mmap_search.py
+# メモリマップしたバイナリファイル上での探索（メモリに載らない大きなデータ向け）
+
+import array
+import mmap
+import os
+
+try:
+    import numpy as np
+except ImportError:  # NumPy がない環境では memoryview のループで探索する
+    np = None
+
+from linear_search import linear_search, linear_search_all
+
+# 対応するレコードの型と array / memoryview の型コード
+RECORD_TYPES = {
+    "int32": "i",
+    "int64": "q",
+    "float64": "d",
+}
+
+# 一度に走査するバイト数（ページサイズの倍数）
+SCAN_CHUNK_BYTES = 16 * 1024 * 1024
+
+class MappedArray:
+    """
+    固定長の数値レコードが並んだバイナリファイルをメモリマップし、配列として扱うクラス
+    
+    要素は Python のリストにコピーされず、ファイルのページを直接読みます。
+    len() とインデックスアクセスに対応しているため、既存の探索関数にもそのまま渡せます。
+    バイトオーダーは実行環境のネイティブなものを前提とします。
+    
+    使い方:
+        with MappedArray("table.bin", "int64") as values:
+            index = values.linear_search(42)
+    """
+    
+    def __init__(self, path, dtype="int64"):
+        if dtype not in RECORD_TYPES:
+            raise ValueError(f"対応していない型です: {dtype}（{', '.join(RECORD_TYPES)} のいずれか）")
+        self.path = path
+        self.dtype = dtype
+        self.typecode = RECORD_TYPES[dtype]
+        self.itemsize = array.array(self.typecode).itemsize
+        
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size % self.itemsize != 0:
+            self._file.close()
+            raise ValueError(f"ファイルサイズ {size} バイトが {dtype} のレコード長の倍数ではありません")
+        
+        if size == 0:
+            # 空のファイルはメモリマップできないため、空の配列として扱う
+            self._mmap = None
+            self._values = memoryview(array.array(self.typecode))
+        else:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._values = memoryview(self._mmap).cast(self.typecode)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """メモリマップとファイルを閉じる"""
+        if self._values is not None:
+            self._values.release()
+            self._values = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+    
+    def __len__(self):
+        return len(self._values)
+    
+    def __getitem__(self, index):
+        return self._values[index]
+    
+    def _release_pages(self, start, stop):
+        """走査し終えた範囲のページをプロセスから切り離し、RSS が増え続けないようにする"""
+        if self._mmap is None or not hasattr(self._mmap, "madvise"):
+            return
+        start_byte = start * self.itemsize
+        start_byte -= start_byte % mmap.PAGESIZE
+        length = stop * self.itemsize - start_byte
+        if length > 0:
+            self._mmap.madvise(mmap.MADV_DONTNEED, start_byte, length)
+    
+    def _iter_chunks(self):
+        """ファイルを先頭から一定サイズずつ区切った (開始, 終了) の範囲を返す"""
+        n = len(self)
+        chunk = max(1, SCAN_CHUNK_BYTES // self.itemsize)
+        for start in range(0, n, chunk):
+            stop = min(start + chunk, n)
+            yield start, stop
+            self._release_pages(start, stop)
+    
+    def _chunk_matches(self, start, stop, target):
+        """範囲 [start, stop) 内で target と一致するインデックスを返す"""
+        if np is not None:
+            # ファイルのバッファをそのまま参照する（コピーなし）
+            values = np.frombuffer(self._mmap, dtype=self.typecode,
+                                   count=stop - start, offset=start * self.itemsize)
+            return (start + np.flatnonzero(values == target)).tolist()
+        return [start + i for i in linear_search_all(self._values[start:stop], target)]
+    
+    def linear_search(self, target):
+        """
+        線形探索アルゴリズム
+        
+        Returns:
+            int: 見つかった場合はそのインデックス、見つからなかった場合は-1
+        """
+        if np is None:
+            for start, stop in self._iter_chunks():
+                found = linear_search(self._values[start:stop], target)
+                if found != -1:
+                    return start + found
+            return -1
+        
+        for start, stop in self._iter_chunks():
+            matches = self._chunk_matches(start, stop, target)
+            if matches:
+                return matches[0]
+        return -1
+    
+    def linear_search_all(self, target):
+        """
+        線形探索アルゴリズム（すべての一致を検出）
+        
+        Returns:
+            list: 見つかった場合はそのインデックスのリスト、見つからなかった場合は空リスト
+        """
+        found_indices = []
+        for start, stop in self._iter_chunks():
+            found_indices.extend(self._chunk_matches(start, stop, target))
+        return found_indices
+    
+    def binary_search(self, target):
+        """
+        二分探索アルゴリズム（ファイルがソート済みであることが前提）
+        
+        探索で読むのは log₂(n) 個のレコードだけなので、読み込まれるページもごくわずかです。
+        
+        Returns:
+            int: 見つかった場合はそのインデックス、見つからなかった場合は-1
+        """
+        values = self._values
+        left, right = 0, len(values) - 1
+        
+        while left <= right:
+            mid = (left + right) // 2
+            if values[mid] == target:
+                return mid
+            elif values[mid] < target:
+                left = mid + 1
+            else:
+                right = mid - 1
+        
+        return -1
+
+def write_records(path, values, dtype="int64"):
+    """
+    数値の並びを固定長レコードのバイナリファイルとして書き出す
+    
+    Parameters:
+        path (str): 出力ファイルのパス
+        values: 書き出す数値のイテラブル
+        dtype (str): レコードの型（int32 / int64 / float64）
+    """
+    typecode = RECORD_TYPES[dtype]
+    buffer = array.array(typecode)
+    with open(path, "wb") as f:
+        for value in values:
+            buffer.append(value)
+            if len(buffer) >= 1 << 20:
+                buffer.tofile(f)
+                del buffer[:]
+        buffer.tofile(f)
+
+def mmap_search_demo():
+    import tempfile
+    
+    size = 5000000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "records.bin")
+        write_records(path, range(0, size * 2, 2), "int64")
+        print(f"{size} 件の int64 レコード（{os.path.getsize(path)} バイト）を書き出しました")
+        
+        with MappedArray(path, "int64") as values:
+            print(f"レコード数: {len(values)}")
+            print(f"linear_search(4000000): {values.linear_search(4000000)}")
+            print(f"linear_search(3): {values.linear_search(3)}")
+            print(f"linear_search_all(1234): {values.linear_search_all(1234)}")
+            print(f"binary_search(9999998): {values.binary_search(9999998)}")
+            print(f"binary_search(7): {values.binary_search(7)}")
+
+if __name__ == "__main__":
+    mmap_search_demo()
@@ -0,0 +1,194 @@
+# parallel_search.py
+# 複数のCPUコアを使った線形探索（共有メモリ上のチャンクを並列に探索）
+
+import array
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # NumPy がない環境では memoryview のループで探索する
+    np = None
+
+from linear_search import linear_search
+
+# これより小さい配列では、プロセス起動のコストの方が大きいため逐次探索を使う
+MIN_PARALLEL_SIZE = 1000000
+
+# ワーカーがキャンセルを確認する間隔（要素数）
+CANCEL_CHECK_INTERVAL = 65536
+
+# ワーカープロセス内で共有する状態
+_worker_state = {}
+
+def _to_typed_array(arr):
+    """
+    配列を共有メモリにコピーできる形式（型コード付きのバッファ）に変換する
+    
+    Returns:
+        tuple: (バッファ, 型コード)、数値配列でない場合は (None, None)
+    """
+    if isinstance(arr, array.array):
+        if arr.typecode in ("u", "w"):  # Unicode 文字の配列
+            return None, None
+        return arr, arr.typecode
+    if np is not None and isinstance(arr, np.ndarray):
+        if arr.ndim == 1 and arr.dtype.kind in "iuf":
+            # 型コードはバイト順を表せないため、ネイティブのバイト順の連続した配列にしてから渡す
+            native = arr.dtype.newbyteorder("=")
+            return np.ascontiguousarray(arr, dtype=native), native.char
+        return None, None
+    if isinstance(arr, list):
+        try:
+            if all(type(value) is int for value in arr):
+                return array.array("q", arr), "q"
+            if all(type(value) is float for value in arr):
+                return array.array("d", arr), "d"
+        except OverflowError:
+            pass
+    return None, None
+
+def available_workers():
+    """このプロセスが使えるCPUコアの数（CPU アフィニティで制限されている場合はその数）"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def _init_worker(shm_name, typecode, length, best_index):
+    """ワーカープロセスの初期化（共有メモリへの接続）"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_state["shm"] = shm
+    _worker_state["typecode"] = typecode
+    _worker_state["length"] = length
+    _worker_state["best_index"] = best_index
+
+def _search_chunk(bounds):
+    """
+    チャンク [start, stop) を探索する（ワーカープロセスで実行）
+    
+    より小さいインデックスで一致が見つかった時点で探索を打ち切る。
+    
+    Returns:
+        int: チャンク内で最初に一致したインデックス、見つからない・打ち切った場合は-1
+    """
+    start, stop, target = bounds
+    shm = _worker_state["shm"]
+    typecode = _worker_state["typecode"]
+    best_index = _worker_state["best_index"]
+    
+    if np is not None:
+        values = np.frombuffer(shm.buf, dtype=typecode, count=_worker_state["length"])
+    else:
+        values = shm.buf.cast(typecode)
+    
+    for block_start in range(start, stop, CANCEL_CHECK_INTERVAL):
+        # 他のワーカーがより前の位置で見つけていれば、このチャンクは不要
+        if best_index.value < block_start:
+            return -1
+        
+        block_stop = min(block_start + CANCEL_CHECK_INTERVAL, stop)
+        found = -1
+        if np is not None:
+            matches = np.flatnonzero(values[block_start:block_stop] == target)
+            if matches.size:
+                found = block_start + int(matches[0])
+        else:
+            for i in range(block_start, block_stop):
+                if values[i] == target:
+                    found = i
+                    break
+        
+        if found != -1:
+            with best_index.get_lock():
+                if found < best_index.value:
+                    best_index.value = found
+            return found
+    
+    return -1
+
+def parallel_linear_search(arr, target, workers=None, chunk_size=None):
+    """
+    線形探索アルゴリズム（マルチプロセス版）
+    
+    配列を共有メモリに置き、チャンクごとに複数のプロセスで同時に探索します。
+    いずれかのワーカーが一致を見つけると、それより後ろのチャンクの探索は打ち切られます。
+    結果は逐次版の linear_search と同じく、最初に一致したインデックスです。
+    
+    Parameters:
+        arr: 探索対象の配列（整数・浮動小数点の list、array.array、NumPy 配列）
+        target: 探索する値
+        workers (int): ワーカープロセス数（省略時は使えるCPUコア数）
+        chunk_size (int): 1チャンクあたりの要素数（省略時は自動）
+    
+    Returns:
+        int: 見つかった場合はそのインデックス、見つからなかった場合は-1
+    """
+    n = len(arr)
+    workers = workers or available_workers()
+    buffer, typecode = _to_typed_array(arr)
+    
+    # 数値配列でない場合・配列が小さい場合・1コアしかない場合は逐次探索
+    if buffer is None or n < MIN_PARALLEL_SIZE or workers < 2:
+        return linear_search(arr, target)
+    
+    if chunk_size is None:
+        # ワーカー数より多めに分割し、前のチャンクから順に処理されるようにする
+        chunk_size = max(CANCEL_CHECK_INTERVAL, -(-n // (workers * 4)))
+    
+    source = memoryview(buffer).cast("B")
+    shm = shared_memory.SharedMemory(create=True, size=source.nbytes)
+    try:
+        shm.buf[:source.nbytes] = source
+        source.release()
+        
+        # 見つかった最小のインデックス（n は「未発見」を表す）
+        best_index = multiprocessing.Value("q", n)
+        chunks = [(start, min(start + chunk_size, n), target) for start in range(0, n, chunk_size)]
+        
+        pool = multiprocessing.Pool(
+            workers, initializer=_init_worker, initargs=(shm.name, typecode, n, best_index)
+        )
+        try:
+            # 結果はチャンクの順に受け取るため、最初に見つかった結果が最小のインデックスになる
+            for found in pool.imap(_search_chunk, chunks):
+                if found != -1:
+                    return found
+            return -1
+        finally:
+            # 残りのワーカーをキャンセルする
+            pool.terminate()
+            pool.join()
+    finally:
+        shm.close()
+        shm.unlink()
+
+def parallel_search_demo():
+    import time
+    
+    size = 10000000
+    numbers = array.array("q", range(size))
+    print(f"配列サイズ: {size}、使えるCPUコア数: {available_workers()}")
+    
+    for label, target in [("先頭付近", 10), ("中央", size // 2), ("末尾", size - 1), ("存在しない", -1)]:
+        start_time = time.perf_counter()
+        sequential = linear_search(numbers, target)
+        sequential_time = time.perf_counter() - start_time
+        
+        start_time = time.perf_counter()
+        parallel = parallel_linear_search(numbers, target)
+        parallel_time = time.perf_counter() - start_time
+        
+        print(f"{label}（値 {target}）: 逐次 {sequential} ({sequential_time:.4f} 秒) / "
+              f"並列 {parallel} ({parallel_time:.4f} 秒)")
+    
+    # ネイティブと異なるバイト順の NumPy 配列でも、逐次探索と同じ位置を返す（コア数によらず2プロセスで探索）
+    if np is not None:
+        swapped_order = ">" if np.little_endian else "<"
+        swapped = np.arange(size // 4, dtype=f"{swapped_order}i8")
+        target = 1234567
+        print(f"\nバイト順 '{swapped_order}' の配列（値 {target}）: 逐次 {linear_search(swapped, target)} / "
+              f"並列 {parallel_linear_search(swapped, target, workers=2)}")
+
+if __name__ == "__main__":
+    parallel_search_demo()
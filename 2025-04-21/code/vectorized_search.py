@@ -0,0 +1,121 @@
+# vectorized_search.py
+# NumPy によるベクトル化した線形探索（数値配列向け）
+
+import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy がない環境では Python のループにフォールバックする
+    np = None
+
+from linear_search import linear_search, linear_search_all
+
+# NumPy の dtype として解釈できない array.array の型コード（Unicode 文字の配列）
+NON_NUMERIC_TYPECODES = ("u", "w")
+
+def as_numeric_array(arr):
+    """
+    数値配列をコピーせずに NumPy 配列として扱えるようにする
+    
+    Parameters:
+        arr: NumPy 配列、array.array、またはその他の配列
+    
+    Returns:
+        numpy.ndarray: ベクトル化できる場合はそのビュー、できない場合は None
+    """
+    if np is None:
+        return None
+    if isinstance(arr, np.ndarray):
+        # 数値型（bool・整数・浮動小数点）の場合のみベクトル化する
+        return arr if arr.dtype.kind in "biuf" else None
+    if isinstance(arr, array.array):
+        if arr.typecode in NON_NUMERIC_TYPECODES:
+            return None
+        if len(arr) == 0:
+            return np.empty(0)
+        # バッファを共有するため、要素のコピーは発生しない
+        return np.frombuffer(arr, dtype=arr.typecode)
+    return None
+
+def _is_numeric_scalar(target):
+    """target が数値配列の要素と比較できる数値かどうか"""
+    if isinstance(target, bool):
+        return False
+    return isinstance(target, (int, float, np.number))
+
+def linear_search_vectorized(arr, target):
+    """
+    線形探索アルゴリズム（ベクトル化版）
+    
+    数値配列では要素の比較を NumPy でまとめて行い、最初に一致した位置を返します。
+    それ以外のオブジェクトでは linear_search にフォールバックします。
+    
+    Parameters:
+        arr: 探索対象の配列（NumPy 配列、array.array、list など）
+        target: 探索する値
+    
+    Returns:
+        int: 見つかった場合はそのインデックス、見つからなかった場合は-1
+    """
+    values = as_numeric_array(arr)
+    if values is None or not _is_numeric_scalar(target):
+        return linear_search(arr, target)
+    
+    matches = np.flatnonzero(values == target)
+    return int(matches[0]) if matches.size else -1
+
+def linear_search_all_vectorized(arr, target):
+    """
+    線形探索アルゴリズム（すべての一致を検出・ベクトル化版）
+    
+    Parameters:
+        arr: 探索対象の配列（NumPy 配列、array.array、list など）
+        target: 探索する値
+    
+    Returns:
+        list: 見つかった場合はそのインデックスのリスト、見つからなかった場合は空リスト
+    """
+    values = as_numeric_array(arr)
+    if values is None or not _is_numeric_scalar(target):
+        return linear_search_all(arr, target)
+    
+    return np.flatnonzero(values == target).tolist()
+
+def vectorized_search_demo():
+    import time
+    
+    size = 1000000
+    numbers = array.array("q", range(size))
+    target = size - 1  # 最悪のケース（末尾の要素）
+    
+    print(f"配列サイズ: {size}、探索値: {target}（末尾の要素）")
+    
+    start_time = time.perf_counter()
+    result = linear_search(numbers, target)
+    loop_time = time.perf_counter() - start_time
+    print(f"Python のループ:   インデックス {result}、{loop_time:.6f} 秒")
+    
+    start_time = time.perf_counter()
+    result = linear_search_vectorized(numbers, target)
+    vectorized_time = time.perf_counter() - start_time
+    print(f"ベクトル化した比較: インデックス {result}、{vectorized_time:.6f} 秒")
+    
+    if np is None:
+        print("NumPy がインストールされていないため、Python のループで探索しました")
+    
+    # すべての一致を検出
+    numbers_with_duplicates = array.array("q", [5, 10, 15, 20, 10, 25, 30, 10])
+    print(f"\n値 10 のすべての出現位置: {linear_search_all_vectorized(numbers_with_duplicates, 10)}")
+    print(f"値 100 のすべての出現位置: {linear_search_all_vectorized(numbers_with_duplicates, 100)}")
+    
+    # 数値以外のオブジェクトは Python のループで探索する
+    words = ["apple", "banana", "cherry"]
+    print(f"\n文字列のリストでの探索: {linear_search_vectorized(words, 'cherry')}")
+    
+    # Unicode 文字の array.array も Python のループで探索する
+    letters = array.array("u", "abcab")
+    print(f"Unicode 文字の配列での探索: 'c' はインデックス {linear_search_vectorized(letters, 'c')}、"
+          f"'b' のすべての出現位置 {linear_search_all_vectorized(letters, 'b')}")
+
+if __name__ == "__main__":
+    vectorized_search_demo()
@@ -1,8 +1,12 @@
 # big_o_examples.py
+# 他の日のフォルダのモジュールを読み込むため、リポジトリのルートから python run.py 2025-04-22/code/big_o_examples.py で実行する
 
-import time
-import matplotlib.pyplot as plt
-import numpy as np
+import argparse
+
+from benchmark_harness import measure_time, write_json_report
+from memory_measure import format_bytes, measure_memory
+from pair_kernels import count_pairs_above, outer_products
+from size_sweep import adaptive_sweep, measure_step, sweep_sizes
 
 def constant_time_example(arr):
     """O(1) - 定数時間の例"""
@@ -24,6 +28,10 @@ def quadratic_time_example(arr):
             result.append(arr[i] * arr[j])
     return result
 
+def quadratic_time_example_vectorized(arr):
+    """O(n²) - 二次時間の例（NumPy の外積で、すべての積を1回の演算で求める）"""
+    return outer_products(arr)
+
 def logarithmic_time_example(arr, target):
     """O(log n) - 対数時間の例（二分探索）"""
     # ソート済みの配列を前提とする
@@ -41,51 +49,76 @@ def logarithmic_time_example(arr, target):
     return -1
 
 def measure_execution_time(func, *args, **kwargs):
-    """関数の実行時間を測定する"""
-    start_time = time.time()
-    result = func(*args, **kwargs)
-    end_time = time.time()
-    return (end_time - start_time), result
+    """関数の実行時間を測定する（共通の計測ツールで1回あたりの最小時間を求める）"""
+    result, execution_time = measure_time(func, *args, **kwargs)
+    return execution_time, result
+
+def measure_fast_examples(size):
+    """サイズ size の配列で O(1)・O(n)・O(log n) の例の実行時間を測定する（adaptive_sweep の1ステップ）"""
+    arr = list(range(size))
+    _, constant_time = measure_step(constant_time_example, arr)
+    _, linear_time = measure_step(linear_time_example, arr)
+    target = size // 2  # 配列の中央付近の値を探索
+    _, logarithmic_time = measure_step(logarithmic_time_example, arr, target)
+    return constant_time, linear_time, logarithmic_time
 
-def demonstrate_time_complexity():
-    """時間計算量のデモンストレーション"""
-    sizes = [100, 1000, 10000, 100000]
+def demonstrate_time_complexity(time_budget=5.0):
+    """
+    時間計算量のデモンストレーション
+    
+    入力サイズは固定せず、時間の予算に収まる範囲で等比的に増やします。
+    速い処理ほど大きなサイズまで、O(n²) の処理は少ない点で測定が止まります。
+    """
+    # O(1)・O(n)・O(log n) は同じ配列で測定する
+    points = adaptive_sweep(measure_fast_examples, time_budget, start_n=100, growth=10)
+    sizes = sweep_sizes(points)
     constant_times = []
     linear_times = []
     logarithmic_times = []
     
-    # O(n²)のサイズを別途設定
-    quadratic_sizes = [10, 50, 100, 500]
-    quadratic_times = []
-    
-    for size in sizes:
-        arr = list(range(size))
+    for point in points:
+        size = point.n
+        constant_time, linear_time, logarithmic_time = point.result
         
-        # O(1) の測定
-        time_taken, _ = measure_execution_time(constant_time_example, arr)
-        constant_times.append(time_taken)
-        print(f"O(1) - サイズ {size}: {time_taken:.6f} 秒")
+        constant_times.append(constant_time)
+        print(f"O(1) - サイズ {size}: {constant_time:.6f} 秒")
         
-        # O(n) の測定
-        time_taken, _ = measure_execution_time(linear_time_example, arr)
-        linear_times.append(time_taken)
-        print(f"O(n) - サイズ {size}: {time_taken:.6f} 秒")
+        linear_times.append(linear_time)
+        print(f"O(n) - サイズ {size}: {linear_time:.6f} 秒")
         
-        # O(log n) の測定
-        target = size // 2  # 配列の中央付近の値を探索
-        time_taken, _ = measure_execution_time(logarithmic_time_example, arr, target)
-        logarithmic_times.append(time_taken)
-        print(f"O(log n) - サイズ {size}: {time_taken:.6f} 秒")
+        logarithmic_times.append(logarithmic_time)
+        print(f"O(log n) - サイズ {size}: {logarithmic_time:.6f} 秒")
     
     print("\nO(n²)の計算量の測定:")
-    for size in quadratic_sizes:
-        arr = list(range(size))
-        # O(n²) の測定
-        time_taken, _ = measure_execution_time(quadratic_time_example, arr)
-        quadratic_times.append(time_taken)
-        print(f"O(n²) - サイズ {size}: {time_taken:.6f} 秒")
+    quadratic_points = adaptive_sweep(
+        lambda n: measure_step(quadratic_time_example, list(range(n)))[1],
+        time_budget, start_n=10,
+    )
+    quadratic_sizes = sweep_sizes(quadratic_points)
+    quadratic_times = []
+    for point in quadratic_points:
+        quadratic_times.append(point.result)
+        print(f"O(n²) - サイズ {point.n}: {point.result:.6f} 秒")
+    
+    # 同じ計算量でも、外積の演算は Python のループより定数倍が小さい
+    largest = quadratic_sizes[-1]
+    vectorized_time, _ = measure_execution_time(quadratic_time_example_vectorized, list(range(largest)))
+    print(f"O(n²)（NumPy の外積） - サイズ {largest}: {vectorized_time:.6f} 秒")
+    
+    # 結果全体を持たずに集計する場合は、タイルごとに計算してメモリを一定に保つ
+    arr = list(range(largest))
+    full = measure_memory(quadratic_time_example_vectorized, (arr,))
+    tiled = measure_memory(count_pairs_above, (arr, largest))
+    print(f"確保量 - 外積全体: {format_bytes(full.peak_bytes)}、タイルごとの集計: {format_bytes(tiled.peak_bytes)}")
     
     return sizes, constant_times, linear_times, logarithmic_times, quadratic_sizes, quadratic_times
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="時間計算量のデモンストレーション")
+    parser.add_argument("--json", help="計測結果を書き出す JSON ファイルのパス")
+    args = parser.parse_args()
+    
     demonstrate_time_complexity()
+    
+    if args.json:
+        write_json_report(args.json)
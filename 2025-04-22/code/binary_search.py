@@ -0,0 +1,182 @@
+# binary_search.py
+# 二分探索（対数時間 O(log n)）の実用版（出力なし・bisect による高速化・一括探索）
+# 他の日のフォルダのモジュールを読み込むため、リポジトリのルートから python run.py 2025-04-22/code/binary_search.py で実行する
+
+import bisect
+
+from lazy_import import is_loaded, lazy_module
+
+# NumPy は最初に使うときに読み込む（ない環境では None になり、bisect による一括探索を使う）
+np = lazy_module("numpy")
+
+def _traced_bound(arr, target, lo, hi, trace, right_side):
+    """
+    トレース付きの境界探索（lower_bound / upper_bound の Python 実装）
+    
+    各ステップで trace(left, right, mid) を呼び出す。
+    left, right は探索範囲 [left, right) を表す。
+    """
+    left, right = lo, hi
+    while left < right:
+        mid = (left + right) // 2
+        trace(left, right, mid)
+        if arr[mid] < target or (right_side and arr[mid] == target):
+            left = mid + 1
+        else:
+            right = mid
+    return left
+
+def lower_bound(arr, target, lo=0, hi=None, trace=None):
+    """
+    target 以上の値が最初に現れるインデックスを返す
+    
+    Parameters:
+        arr (list): ソート済みの探索対象配列
+        target: 探索する値
+        lo, hi (int): 探索範囲 [lo, hi)（省略時は配列全体）
+        trace (callable): 各ステップで trace(left, right, mid) を呼ぶデバッグ用フック（省略時は呼ばない）
+    
+    Returns:
+        int: 挿入位置（すべての値が target 未満の場合は hi）
+    """
+    if hi is None:
+        hi = len(arr)
+    if trace is None:
+        # フックがない場合は C 実装の bisect を使う
+        return bisect.bisect_left(arr, target, lo, hi)
+    return _traced_bound(arr, target, lo, hi, trace, right_side=False)
+
+def upper_bound(arr, target, lo=0, hi=None, trace=None):
+    """
+    target より大きい値が最初に現れるインデックスを返す
+    
+    Parameters:
+        arr (list): ソート済みの探索対象配列
+        target: 探索する値
+        lo, hi (int): 探索範囲 [lo, hi)（省略時は配列全体）
+        trace (callable): 各ステップで trace(left, right, mid) を呼ぶデバッグ用フック（省略時は呼ばない）
+    
+    Returns:
+        int: 挿入位置（すべての値が target 以下の場合は hi）
+    """
+    if hi is None:
+        hi = len(arr)
+    if trace is None:
+        return bisect.bisect_right(arr, target, lo, hi)
+    return _traced_bound(arr, target, lo, hi, trace, right_side=True)
+
+def equal_range(arr, target, trace=None):
+    """
+    target と等しい値が並ぶ範囲を返す
+    
+    Returns:
+        tuple: (開始, 終了) の半開区間。存在しない場合は開始 == 終了
+    """
+    first = lower_bound(arr, target, trace=trace)
+    # 上限の探索は、下限から先だけを対象にすればよい
+    return first, upper_bound(arr, target, lo=first, trace=trace)
+
+def binary_search(arr, target, trace=None):
+    """
+    二分探索アルゴリズム
+    
+    Parameters:
+        arr (list): ソート済みの探索対象配列
+        target: 探索する値
+        trace (callable): 各ステップで trace(left, right, mid) を呼ぶデバッグ用フック（省略時は呼ばない）
+    
+    Returns:
+        int: 見つかった場合は最初に一致したインデックス、見つからなかった場合は-1
+    """
+    index = lower_bound(arr, target, trace=trace)
+    if index < len(arr) and arr[index] == target:
+        return index
+    return -1
+
+def _gallop_bound(arr, target, lo, n, right_side):
+    """
+    lo から指数的に範囲を広げてから二分探索する（前回の位置の近くに答えがある場合に速い）
+    """
+    search = bisect.bisect_right if right_side else bisect.bisect_left
+    step = 1
+    while lo + step < n and (arr[lo + step] <= target if right_side else arr[lo + step] < target):
+        step *= 2
+    return search(arr, target, lo + step // 2, min(lo + step, n))
+
+def batch_bounds(arr, queries, side="left"):
+    """
+    複数の値の挿入位置をまとめて求める
+    
+    - NumPy 配列の場合: np.searchsorted でまとめて計算する
+    - それ以外の場合: クエリを昇順に処理し、前回の結果より後ろだけを探索する
+      （探索範囲が徐々に狭まるため、全体で O(k log(n/k))）
+    
+    Parameters:
+        arr: ソート済みの探索対象配列
+        queries: 探索する値の並び（ソートされていなくてもよい）
+        side (str): "left" なら lower_bound、"right" なら upper_bound
+    
+    Returns:
+        list: 各クエリの挿入位置（queries と同じ順序）。arr が NumPy 配列の場合は NumPy 配列
+    """
+    if side not in ("left", "right"):
+        raise ValueError(f"side は 'left' か 'right' を指定してください: {side}")
+    
+    if is_loaded(np) and isinstance(arr, np.ndarray):
+        return np.searchsorted(arr, queries, side=side)
+    
+    n = len(arr)
+    right_side = side == "right"
+    results = [0] * len(queries)
+    order = sorted(range(len(queries)), key=queries.__getitem__)
+    
+    lo = 0
+    for query_index in order:
+        lo = _gallop_bound(arr, queries[query_index], lo, n, right_side)
+        results[query_index] = lo
+    
+    return results
+
+def batch_binary_search(arr, queries):
+    """
+    複数の値を二分探索でまとめて探す
+    
+    Returns:
+        list: 各クエリについて、見つかった場合は最初に一致したインデックス、見つからなかった場合は-1
+    """
+    positions = batch_bounds(arr, queries)
+    n = len(arr)
+    return [
+        int(position) if position < n and arr[position] == query else -1
+        for position, query in zip(positions, queries)
+    ]
+
+def print_trace(left, right, mid):
+    """探索範囲だけを表示するトレース用フック（1ステップあたり O(1)）"""
+    print(f"探索範囲: [{left}, {right})、中央: mid={mid}")
+
+def binary_search_demo():
+    sorted_array = list(range(0, 2000000, 2))  # 0, 2, 4, ..., 1999998
+    
+    print("=== 二分探索 ===")
+    print(f"binary_search(arr, 123456): {binary_search(sorted_array, 123456)}")
+    print(f"binary_search(arr, 7): {binary_search(sorted_array, 7)}")
+    
+    print("\n=== 境界の探索 ===")
+    duplicates = [1, 3, 3, 3, 5, 7]
+    print(f"配列: {duplicates}")
+    print(f"lower_bound(3): {lower_bound(duplicates, 3)}")
+    print(f"upper_bound(3): {upper_bound(duplicates, 3)}")
+    print(f"equal_range(3): {equal_range(duplicates, 3)}")
+    print(f"equal_range(4): {equal_range(duplicates, 4)}")
+    
+    print("\n=== 一括探索 ===")
+    queries = [1999998, 10, 11, 500000]
+    print(f"クエリ: {queries}")
+    print(f"batch_binary_search: {batch_binary_search(sorted_array, queries)}")
+    
+    print("\n=== トレース付きの探索（大きな配列でも1ステップ O(1)） ===")
+    binary_search(sorted_array, 123456, trace=print_trace)
+
+if __name__ == "__main__":
+    binary_search_demo()
@@ -1,49 +1,178 @@
 # time_complexity_visualizer.py
+# 他の日のフォルダのモジュールを読み込むため、リポジトリのルートから python run.py 2025-04-22/code/time_complexity_visualizer.py で実行する
 
-import matplotlib.pyplot as plt
-import numpy as np
+import functools
+import os
 
-def plot_time_complexities(max_n=100):
+from lazy_import import lazy_module
+
+# NumPy は最初に曲線を計算するときに読み込む（matplotlib は new_figure で読み込む）
+np = lazy_module("numpy")
+
+# SVG の要素の ID を実行ごとに変えないための値（同じ入力から同じファイルを作る）
+SVG_HASH_SALT = "time-complexity-visualizer"
+
+# 計算量のモデル: ラベル → (凡例, log2(操作回数) を求める関数)
+# 値そのものではなく log2 で計算するため、2^n のように大きな値でも桁あふれしない
+CURVE_MODELS = {
+    "O(1)": ("O(1) - 定数時間", lambda n, log_n: np.zeros_like(log_n)),
+    "O(log n)": ("O(log n) - 対数時間", lambda n, log_n: np.log2(log_n)),
+    "O(n)": ("O(n) - 線形時間", lambda n, log_n: log_n),
+    "O(n log n)": ("O(n log n) - 線形対数時間", lambda n, log_n: log_n + np.log2(log_n)),
+    "O(n²)": ("O(n²) - 二次時間", lambda n, log_n: 2 * log_n),
+    "O(n³)": ("O(n³) - 三次時間", lambda n, log_n: 3 * log_n),
+    "O(2^n)": ("O(2^n) - 指数時間", lambda n, log_n: n),
+}
+
+# ファイルの形式ごとの保存時のメタデータ（日時を含めず、同じ内容なら同じファイルになるようにする）
+SAVE_METADATA = {
+    "png": {"Software": None},
+    "svg": {"Date": None},
+    "pdf": {"CreationDate": None},
+}
+
+# 既定で描画するグラフ
+# (ファイル名（拡張子なし）, タイトル, モデルのラベル, 最大の n, log2 の縦軸にするか)
+CHART_SPECS = [
+    ("time_complexity_comparison", "異なる時間計算量の成長率比較",
+     ["O(1)", "O(log n)", "O(n)", "O(n log n)", "O(n²)", "O(n³)", "O(2^n)"], 100, False),
+    ("linear_vs_quadratic", "線形時間 vs 二次時間の比較", ["O(n)", "O(n²)"], 100, False),
+    ("time_complexity_log_scale", "異なる時間計算量の成長率比較（log2 の縦軸）",
+     ["O(1)", "O(log n)", "O(n)", "O(n log n)", "O(n²)", "O(n³)", "O(2^n)"], 10000, True),
+]
+
+@functools.lru_cache(maxsize=None)
+def input_sizes(max_n):
+    """n = 1, 2, ..., max_n の配列（キャッシュするため書き換え不可）"""
+    n = np.arange(1, max_n + 1, dtype=np.float64)
+    n.flags.writeable = False
+    return n
+
+@functools.lru_cache(maxsize=None)
+def curve_log2(model, max_n):
     """
-    異なる時間計算量の成長率をプロットする
+    計算量のモデルの n = 1..max_n での log2(操作回数) を求める
+    
+    (model, max_n) ごとにキャッシュし、同じ曲線を何度も計算しないようにします。
+    返す配列は書き換え不可です。
     
     Parameters:
-        max_n (int): プロットする最大のn値
+        model (str): CURVE_MODELS のラベル
+        max_n (int): 最大の n
+    
+    Returns:
+        numpy.ndarray: log2(操作回数)（O(log n) の n = 1 では -inf）
+    """
+    if model not in CURVE_MODELS:
+        raise ValueError(f"未対応のモデルです: {model}")
+    n = input_sizes(max_n)
+    with np.errstate(divide="ignore"):
+        values = CURVE_MODELS[model][1](n, np.log2(n))
+    values = np.asarray(values, dtype=np.float64)
+    values.flags.writeable = False
+    return values
+
+def scale_shift(model, max_n, limit_log2=None):
     """
-    n = np.arange(1, max_n + 1)
+    curve_values で曲線を縮める量（log2 での値。縮めない場合は 0）
     
-    # 各計算量の関数
-    constant = np.ones_like(n)  # O(1)
-    logarithmic = np.log2(n)    # O(log n)
-    linear = n                  # O(n)
-    linearithmic = n * np.log2(n)  # O(n log n)
-    quadratic = n ** 2          # O(n²)
-    cubic = n ** 3              # O(n³)
-    exponential = 2 ** n        # O(2^n)
+    最大値が 2^limit_log2 を超える場合だけ縮めるため、0 かどうかは描画する範囲によって変わります。
+    """
+    if limit_log2 is None:
+        return 0.0
+    return max(0.0, float(curve_log2(model, max_n)[-1]) - limit_log2)
+
+def curve_values(model, max_n, limit_log2=None):
+    """
+    操作回数の曲線（線形の縦軸で描画する値）
     
-    # 指数関数の値が大きすぎるため、表示用にスケーリング
-    exponential = exponential / (2 ** max_n) * quadratic[-1] * 1.5
+    limit_log2 を指定すると、最大値が 2^limit_log2 を超える場合に、最大値がちょうど 2^limit_log2 になるように
+    曲線全体を 2^scale_shift(...) 分の1に縮めます
+    （2^n を他の曲線と同じグラフに載せるための縮小。log2 で計算するため桁あふれしない）。
+    """
+    return np.exp2(curve_log2(model, max_n) - scale_shift(model, max_n, limit_log2))
+
+def _draw_chart(figure, title, models, max_n, log_scale):
+    """1つのグラフを figure に描く"""
+    axes = figure.add_subplot()
+    n = input_sizes(max_n)
+    # 2^n は O(n²) の最大値の 1.5 倍に縮めて表示する（線形の縦軸の場合）
+    limit_log2 = 2 * np.log2(max_n) + np.log2(1.5)
     
-    # プロットの設定
-    plt.figure(figsize=(12, 8))
-    plt.plot(n, constant, label='O(1) - 定数時間')
-    plt.plot(n, logarithmic, label='O(log n) - 対数時間')
-    plt.plot(n, linear, label='O(n) - 線形時間')
-    plt.plot(n, linearithmic, label='O(n log n) - 線形対数時間')
-    plt.plot(n, quadratic, label='O(n²) - 二次時間')
-    plt.plot(n, cubic, label='O(n³) - 三次時間')
-    plt.plot(n, exponential, label='O(2^n) - 指数時間 (スケーリング済み)')
+    for model in models:
+        label = CURVE_MODELS[model][0]
+        if log_scale:
+            axes.plot(n, curve_log2(model, max_n), label=label)
+        elif model == "O(2^n)" and len(models) > 1:
+            # 縮めた場合は、縮めた倍率を凡例に示す（描画する範囲によって倍率が変わるため）
+            shift = scale_shift(model, max_n, limit_log2)
+            scaled_label = f"{label} (2^{shift:.1f} 分の1に縮小)" if shift > 0 else label
+            axes.plot(n, curve_values(model, max_n, limit_log2), label=scaled_label)
+        else:
+            axes.plot(n, curve_values(model, max_n), label=label, linewidth=2 if len(models) <= 2 else None)
     
-    plt.xlabel('入力サイズ (n)')
-    plt.ylabel('操作回数')
-    plt.title('異なる時間計算量の成長率比較')
-    plt.legend()
-    plt.grid(True)
+    axes.set_xlabel('入力サイズ (n)')
+    axes.set_ylabel('log2(操作回数)' if log_scale else '操作回数')
+    axes.set_title(title)
+    axes.legend()
+    axes.grid(True)
+
+def new_figure(figsize):
+    """
+    Agg で描画する Figure を作る
     
-    # 保存
-    plt.savefig('time_complexity_comparison.png')
-    plt.close()
+    pyplot を使わずに Figure に Agg のキャンバスを付けるため、画面のない環境でも描画できます。
+    matplotlib は最初に呼ばれたときに読み込みます（グラフを描かない処理の起動を遅くしない）。
+    """
+    import matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
     
+    matplotlib.rcParams["svg.hashsalt"] = SVG_HASH_SALT
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+def save_figure(figure, path):
+    """グラフをファイルに保存する（形式は拡張子から決め、日時などのメタデータを含めない）"""
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    figure.savefig(path, metadata=SAVE_METADATA.get(extension))
+
+def render_charts(specs=None, output_dir=".", formats=("png",)):
+    """
+    複数のグラフをまとめてファイルに描画する
+    
+    pyplot の状態を使わずにグラフごとに new_figure で Figure を作り、Agg で描画します。
+    曲線は curve_log2 のキャッシュを共有するため、同じ (モデル, max_n) は一度だけ計算されます。
+    
+    Parameters:
+        specs (list): (ファイル名, タイトル, モデルのラベル, 最大の n, log2 の縦軸にするか) のリスト
+                      （省略時は CHART_SPECS）
+        output_dir (str): 出力先のディレクトリ
+        formats (tuple): 出力する形式（"png"、"svg"、"pdf"）
+    
+    Returns:
+        list: 書き出したファイルのパス
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for name, title, models, max_n, log_scale in specs or CHART_SPECS:
+        figure = new_figure((12, 8) if len(models) > 2 else (10, 6))
+        _draw_chart(figure, title, models, max_n, log_scale)
+        for extension in formats:
+            path = os.path.join(output_dir, f"{name}.{extension}")
+            save_figure(figure, path)
+            paths.append(path)
+    return paths
+
+def plot_time_complexities(max_n=100):
+    """
+    異なる時間計算量の成長率をプロットする
+    
+    Parameters:
+        max_n (int): プロットする最大のn値
+    """
+    render_charts([CHART_SPECS[0][:3] + (max_n, False)])
     print("グラフが 'time_complexity_comparison.png' として保存されました")
 
 def plot_specific_comparison(max_n=100):
@@ -53,27 +182,7 @@ def plot_specific_comparison(max_n=100):
     Parameters:
         max_n (int): プロットする最大のn値
     """
-    n = np.arange(1, max_n + 1)
-    
-    # 計算量関数
-    linear = n                  # O(n)
-    quadratic = n ** 2          # O(n²)
-    
-    # プロットの設定
-    plt.figure(figsize=(10, 6))
-    plt.plot(n, linear, label='O(n) - 線形時間', linewidth=2)
-    plt.plot(n, quadratic, label='O(n²) - 二次時間', linewidth=2)
-    
-    plt.xlabel('入力サイズ (n)')
-    plt.ylabel('操作回数')
-    plt.title('線形時間 vs 二次時間の比較')
-    plt.legend()
-    plt.grid(True)
-    
-    # 保存
-    plt.savefig('linear_vs_quadratic.png')
-    plt.close()
-    
+    render_charts([CHART_SPECS[1][:3] + (max_n, False)])
     print("グラフが 'linear_vs_quadratic.png' として保存されました")
 
 if __name__ == "__main__":
@@ -0,0 +1,198 @@
+# array_containers.py
+# 配列操作を list、array.array('q')、collections.deque、NumPy 配列で実行して比較する
+
+import array
+import itertools
+from collections import deque
+
+from benchmark_harness import benchmark
+from inplace_map import double_all_elements_inplace
+from lazy_import import lazy_module
+from memory_measure import deep_sizeof, format_bytes, measure_memory
+from ring_buffer import RingBuffer
+
+# NumPy は最初に使うときに読み込む（ない環境では None になり、標準ライブラリのコンテナだけを比較する）
+np = lazy_module("numpy")
+
+# 比較する操作（array_operations_complexity の関数と同じ名前）
+OPERATIONS = [
+    "insert_at_beginning",
+    "append_to_end",
+    "double_all_elements",
+    "combine_arrays",
+    "access_element",
+]
+
+# 入力を書き換える操作（計測のたびに新しいコンテナを作る）
+_MUTATING_OPERATIONS = {"insert_at_beginning", "append_to_end", "double_all_elements"}
+
+class Container:
+    """
+    1種類のコンテナでの配列操作の実装
+    
+    各操作はコンテナを受け取り、操作後のコンテナ（または取り出した要素）を返します。
+    NumPy 配列のように大きさを変えられないコンテナでは、新しいコンテナを返します。
+    """
+    
+    def __init__(self, name, create, insert_at_beginning, append_to_end,
+                 double_all_elements, combine_arrays, access_element):
+        self.name = name
+        self.create = create
+        self.insert_at_beginning = insert_at_beginning
+        self.append_to_end = append_to_end
+        self.double_all_elements = double_all_elements
+        self.combine_arrays = combine_arrays
+        self.access_element = access_element
+    
+    def operation(self, name):
+        """操作名に対応する関数を返す"""
+        if name not in OPERATIONS:
+            raise ValueError(f"未対応の操作です: {name}")
+        return getattr(self, name)
+    
+    def __repr__(self):
+        return f"Container({self.name!r})"
+
+# ==== list（array.array も同じ操作で扱える） ====
+def _sequence_double(arr):
+    for i in range(len(arr)):
+        arr[i] = arr[i] * 2
+    return arr
+
+def _sequence_insert(arr, element):
+    arr.insert(0, element)
+    return arr
+
+def _sequence_append(arr, element):
+    arr.append(element)
+    return arr
+
+LIST = Container(
+    "list",
+    create=lambda size: list(range(size)),
+    insert_at_beginning=_sequence_insert,
+    append_to_end=_sequence_append,
+    double_all_elements=_sequence_double,
+    combine_arrays=lambda arr1, arr2: arr1 + arr2,
+    access_element=lambda arr, index: arr[index],
+)
+
+# ==== array.array('q')（要素を8バイトの整数として詰めて持つ） ====
+ARRAY = Container(
+    "array('q')",
+    create=lambda size: array.array("q", range(size)),
+    insert_at_beginning=_sequence_insert,
+    append_to_end=_sequence_append,
+    double_all_elements=double_all_elements_inplace,
+    combine_arrays=lambda arr1, arr2: arr1 + arr2,
+    access_element=lambda arr, index: arr[index],
+)
+
+# ==== collections.deque（両端への追加は O(1)、中央付近へのアクセスは O(n)） ====
+def _appendleft(arr, element):
+    arr.appendleft(element)
+    return arr
+
+def _deque_double(arr):
+    # 添字でのアクセスは O(n) のため、先頭から取り出して末尾に戻す
+    for _ in range(len(arr)):
+        arr.append(arr.popleft() * 2)
+    return arr
+
+def _deque_combine(arr1, arr2):
+    combined = deque(arr1)
+    combined.extend(arr2)
+    return combined
+
+DEQUE = Container(
+    "deque",
+    create=lambda size: deque(range(size)),
+    insert_at_beginning=_appendleft,
+    append_to_end=_sequence_append,
+    double_all_elements=_deque_double,
+    combine_arrays=_deque_combine,
+    access_element=lambda arr, index: arr[index],
+)
+
+# ==== RingBuffer（両端への追加も添字でのアクセスも O(1)） ====
+RING_BUFFER = Container(
+    "RingBuffer",
+    create=lambda size: RingBuffer(range(size)),
+    insert_at_beginning=_appendleft,
+    append_to_end=_sequence_append,
+    double_all_elements=_sequence_double,
+    combine_arrays=lambda arr1, arr2: RingBuffer(itertools.chain(arr1, arr2)),
+    access_element=lambda arr, index: arr[index],
+)
+
+# ==== NumPy 配列（大きさは固定なので、挿入・追加は新しい配列を作る） ====
+NUMPY = None
+if np is not None:
+    NUMPY = Container(
+        "numpy",
+        create=lambda size: np.arange(size, dtype=np.int64),
+        insert_at_beginning=lambda arr, element: np.insert(arr, 0, element),
+        append_to_end=lambda arr, element: np.append(arr, element),
+        double_all_elements=double_all_elements_inplace,
+        combine_arrays=lambda arr1, arr2: np.concatenate((arr1, arr2)),
+        access_element=lambda arr, index: arr[index],
+    )
+
+def available_containers():
+    """この環境で使えるコンテナのリスト"""
+    return [container for container in (LIST, ARRAY, DEQUE, RING_BUFFER, NUMPY) if container is not None]
+
+def _operation_args(container, operation, size):
+    """操作に渡す引数を作る"""
+    if operation in ("insert_at_beginning", "append_to_end"):
+        return (container.create(size), -1)
+    if operation == "double_all_elements":
+        return (container.create(size),)
+    if operation == "combine_arrays":
+        return (container.create(size), container.create(size))
+    return (container.create(size), size // 2)
+
+def compare_containers(size, operations=None, containers=None, time_budget=0.2):
+    """
+    各コンテナで各操作を実行し、実行時間とメモリを計測する
+    
+    Parameters:
+        size (int): 配列のサイズ
+        operations (list): 計測する操作名（省略時は OPERATIONS のすべて）
+        containers (list): 計測する Container（省略時は available_containers()）
+        time_budget (float): 1つの操作の時間の計測に使う時間の目安（秒）
+    
+    Returns:
+        list: (操作名, コンテナ名, 実行時間（秒）, 操作中の確保量（バイト）, コンテナの大きさ（バイト）) のリスト
+    """
+    rows = []
+    for container in containers or available_containers():
+        storage = deep_sizeof(container.create(size))
+        for operation in operations or OPERATIONS:
+            function = container.operation(operation)
+            name = f"{container.name}.{operation}"
+            if operation in _MUTATING_OPERATIONS:
+                setup = lambda: _operation_args(container, operation, size)
+                timing = benchmark(function, setup=setup, name=name, time_budget=time_budget)
+                memory = measure_memory(function, setup=setup, name=name)
+            else:
+                args = _operation_args(container, operation, size)
+                timing = benchmark(function, args, name=name, time_budget=time_budget)
+                memory = measure_memory(function, args, name=name)
+            rows.append((operation, container.name, timing.min_seconds, memory.peak_bytes, storage))
+    return rows
+
+def print_container_comparison(rows):
+    """比較結果を操作ごとの表で表示する"""
+    print(f"{'操作':<22} {'コンテナ':<12} {'実行時間(秒)':>14} {'確保量':>12} {'コンテナの大きさ':>16}")
+    print("-" * 82)
+    for operation in OPERATIONS:
+        for row_operation, name, seconds, peak_bytes, storage in rows:
+            if row_operation == operation:
+                print(f"{operation:<22} {name:<12} {seconds:>14.8f} "
+                      f"{format_bytes(peak_bytes):>12} {format_bytes(storage):>16}")
+
+if __name__ == "__main__":
+    size = 100000
+    print(f"配列サイズ {size} でのコンテナごとの比較\n")
+    print_container_comparison(compare_containers(size))
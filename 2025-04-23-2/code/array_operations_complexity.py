@@ -1,15 +1,19 @@
 # array_operations_complexity.py
 # 様々な配列操作の計算量分析
 
-import time
+import argparse
+import array
 import sys
 
-def measure_time(func, *args, **kwargs):
-    """関数の実行時間を計測する"""
-    start_time = time.time()
-    result = func(*args, **kwargs)
-    end_time = time.time()
-    return result, end_time - start_time
+from array_containers import compare_containers, print_container_comparison
+from benchmark_harness import benchmark, measure_time, write_json_report
+from complexity_fitter import print_complexity_fit
+from concat_view import combine_arrays_view
+from inplace_map import double_all_elements_inplace
+from memory_measure import deep_sizeof, format_bytes, measure_memory
+from pair_kernels import pair_count
+from ring_buffer import RingBuffer
+from size_sweep import adaptive_sweep, measure_step, sweep_sizes
 
 # ==== 配列の先頭に要素を挿入する操作（O(n)） ====
 def insert_at_beginning(arr, element):
@@ -24,15 +28,71 @@ def test_insert_at_beginning():
     print("理由: すべての既存要素をシフトする必要があるため")
     
     sizes = [1000, 10000, 100000]
+    times = []
     
     for size in sizes:
-        # テスト用の配列を作成
-        arr = list(range(size))
+        # 実行時間の計測（毎回新しい配列を作成し、作成時間は計測に含めない）
+        execution_time = benchmark(
+            insert_at_beginning, setup=lambda: (list(range(size)), -1)
+        ).min_seconds
+        memory = measure_memory(insert_at_beginning, setup=lambda: (list(range(size)), -1))
         
-        # 実行時間の計測
-        _, execution_time = measure_time(insert_at_beginning, arr.copy(), -1)
+        print(f"配列サイズ {size}: {execution_time:.8f} 秒、確保量 {format_bytes(memory.peak_bytes)}")
+        times.append(execution_time)
+    
+    print_complexity_fit(sizes, times, expected="O(n)", tolerance=1)
+
+# ==== リングバッファの先頭に要素を挿入する操作（O(1)償却） ====
+def insert_at_beginning_ring_buffer(buffer, element):
+    """リングバッファの先頭に要素を挿入する"""
+    # 既存の要素をずらさず、先頭の位置を1つ前に動かすだけ
+    buffer.appendleft(element)
+    return buffer
+
+def repeated_insert_ring_buffer(count):
+    """空のリングバッファの先頭に count 個の要素を挿入する - 全体で O(count)"""
+    buffer = RingBuffer()
+    for i in range(count):
+        insert_at_beginning_ring_buffer(buffer, i)
+    return buffer
+
+def repeated_insert_list(count):
+    """空の list の先頭に count 個の要素を挿入する - 全体で O(count²)"""
+    arr = []
+    for i in range(count):
+        insert_at_beginning(arr, i)
+    return arr
+
+def test_insert_at_beginning_ring_buffer():
+    print("\n===== リングバッファの先頭に要素を挿入する操作 =====")
+    print("理論的計算量: O(1) [償却]")
+    print("理由: 環状の配列の先頭位置を動かすだけで、既存要素をシフトしないため")
+    
+    sizes = [1000, 10000, 100000, 1000000]
+    times = []
+    
+    for size in sizes:
+        # 実行時間の計測（同じバッファへの挿入を繰り返し、容量の拡張も含めた償却時間を求める）
+        _, execution_time = measure_time(insert_at_beginning_ring_buffer, RingBuffer(range(size)), -1)
+        list_time = benchmark(
+            insert_at_beginning, setup=lambda: (list(range(size)), -1)
+        ).min_seconds
         
-        print(f"配列サイズ {size}: {execution_time:.8f} 秒")
+        print(f"配列サイズ {size}: {execution_time:.8f} 秒（list.insert(0, x): {list_time:.8f} 秒）")
+        times.append(execution_time)
+    
+    print_complexity_fit(sizes, times, expected="O(1)", tolerance=1)
+    
+    # 先頭への挿入を繰り返す場合（list は全体で O(k²)、リングバッファは O(k)）
+    count = 50000
+    buffer_time = benchmark(repeated_insert_ring_buffer, (count,), repeat=3).min_seconds
+    list_time = benchmark(repeated_insert_list, (count,), repeat=3).min_seconds
+    print(f"\n空の配列の先頭に {count} 回挿入: リングバッファ {buffer_time:.6f} 秒、list {list_time:.6f} 秒")
+    
+    # 添字でのアクセスも O(1)（deque と違い中央付近でも速い）
+    buffer = RingBuffer(range(1000000))
+    _, access_time = measure_time(access_element, buffer, 500000)
+    print(f"配列サイズ 1000000 の中央の要素へのアクセス: {access_time:.8f} 秒")
 
 # ==== 配列の末尾に要素を追加する操作（O(1)償却） ====
 def append_to_end(arr, element):
@@ -47,6 +107,7 @@ def test_append_to_end():
     print("理由: 通常は定数時間だが、配列の再割り当てが必要な場合はO(n)になる")
     
     sizes = [1000, 10000, 100000, 1000000]
+    times = []
     
     for size in sizes:
         # テスト用の配列を作成
@@ -54,8 +115,12 @@ def test_append_to_end():
         
         # 実行時間の計測
         _, execution_time = measure_time(append_to_end, arr.copy(), size)
+        memory = measure_memory(append_to_end, setup=lambda: (arr.copy(), size))
         
-        print(f"配列サイズ {size}: {execution_time:.8f} 秒")
+        print(f"配列サイズ {size}: {execution_time:.8f} 秒、確保量 {format_bytes(memory.peak_bytes)}")
+        times.append(execution_time)
+    
+    print_complexity_fit(sizes, times, expected="O(1)", tolerance=1)
 
 # ==== 配列内のすべての要素を2倍にする操作（O(n)） ====
 def double_all_elements(arr):
@@ -70,15 +135,40 @@ def test_double_all_elements():
     print("理由: 各要素を1回ずつ処理する必要があるため")
     
     sizes = [1000, 10000, 100000, 1000000]
+    times = []
     
     for size in sizes:
-        # テスト用の配列を作成
-        arr = list(range(size))
+        # 実行時間の計測（毎回新しい配列を作成し、作成時間は計測に含めない）
+        execution_time = benchmark(
+            double_all_elements, setup=lambda: (list(range(size)),)
+        ).min_seconds
+        memory = measure_memory(double_all_elements, setup=lambda: (list(range(size)),))
         
-        # 実行時間の計測
-        _, execution_time = measure_time(double_all_elements, arr.copy())
+        print(f"配列サイズ {size}: {execution_time:.8f} 秒、確保量 {format_bytes(memory.peak_bytes)}")
+        times.append(execution_time)
+    
+    print_complexity_fit(sizes, times, expected="O(n)", tolerance=1)
+
+def test_double_all_elements_inplace():
+    print("\n===== 配列内のすべての要素を2倍にする操作（ufunc で書き換える） =====")
+    print("理論的計算量: O(n)")
+    print("理由: 計算量は同じだが、ループを NumPy の ufunc で行い、新しい配列も作らないため")
+    
+    sizes = [1000, 10000, 100000, 1000000]
+    times = []
+    
+    for size in sizes:
+        # 実行時間とメモリの計測（毎回新しい配列を作成し、作成時間は計測に含めない）
+        setup = lambda: (array.array("q", range(size)),)
+        execution_time = benchmark(double_all_elements_inplace, setup=setup).min_seconds
+        memory = measure_memory(double_all_elements_inplace, setup=setup)
+        list_time = benchmark(double_all_elements, setup=lambda: (list(range(size)),)).min_seconds
         
-        print(f"配列サイズ {size}: {execution_time:.8f} 秒")
+        print(f"配列サイズ {size}: {execution_time:.8f} 秒、確保量 {format_bytes(memory.peak_bytes)}"
+              f"（list のループ: {list_time:.8f} 秒）")
+        times.append(execution_time)
+    
+    print_complexity_fit(sizes, times, expected="O(n)", tolerance=1)
 
 # ==== 2つの配列を結合する操作（O(n + m)） ====
 def combine_arrays(arr1, arr2):
@@ -86,12 +176,18 @@ def combine_arrays(arr1, arr2):
     # Python のリストでは、+ 演算子または extend メソッドを使用
     return arr1 + arr2
 
+def combine_arrays_extend(arr1, arr2):
+    """1つ目の配列の末尾に2つ目の配列を追加する（arr1 を書き換える）"""
+    arr1.extend(arr2)
+    return arr1
+
 def test_combine_arrays():
     print("\n===== 2つの配列を結合する操作 =====")
     print("理論的計算量: O(n + m)")
     print("理由: nとmは各配列のサイズで、すべての要素をコピーする必要があるため")
     
     sizes = [1000, 10000, 100000]
+    times = []
     
     for size in sizes:
         # テスト用の配列を作成
@@ -100,8 +196,26 @@ def test_combine_arrays():
         
         # 実行時間の計測
         _, execution_time = measure_time(combine_arrays, arr1.copy(), arr2.copy())
+        memory = measure_memory(combine_arrays, (arr1, arr2))
+        
+        print(f"配列サイズ {size} + {size}: {execution_time:.8f} 秒、確保量 {format_bytes(memory.peak_bytes)}")
+        times.append(execution_time)
+        
+        # extend（arr1 を書き換えるため毎回コピーを渡す）とコピーしないビューとの比較
+        extend_setup = lambda: (arr1.copy(), arr2)
+        extend_time = benchmark(combine_arrays_extend, setup=extend_setup).min_seconds
+        extend_memory = measure_memory(combine_arrays_extend, setup=extend_setup)
+        _, view_time = measure_time(combine_arrays_view, arr1, arr2)
+        view_memory = measure_memory(combine_arrays_view, (arr1, arr2))
+        print(f"  extend: {extend_time:.8f} 秒、確保量 {format_bytes(extend_memory.peak_bytes)}")
+        print(f"  ConcatView: {view_time:.8f} 秒、確保量 {format_bytes(view_memory.peak_bytes)}")
         
-        print(f"配列サイズ {size} + {size}: {execution_time:.8f} 秒")
+        # 結合した結果を1回たどる場合（+ はコピーしてからたどり、ビューはそのままたどる）
+        _, copy_sum_time = measure_time(lambda: sum(combine_arrays(arr1, arr2)))
+        _, view_sum_time = measure_time(lambda: sum(combine_arrays_view(arr1, arr2)))
+        print(f"  結合して合計: + {copy_sum_time:.8f} 秒、ConcatView {view_sum_time:.8f} 秒")
+    
+    print_complexity_fit(sizes, times, expected="O(n)", tolerance=1)
 
 # ==== 入れ子になった2つのfor文での処理（O(n²)） ====
 def nested_loops_processing(arr):
@@ -113,21 +227,40 @@ def nested_loops_processing(arr):
             count += 1
     return count
 
+def nested_loops_processing_closed_form(arr):
+    """入れ子のループと同じ処理回数を式で求める（O(1)）"""
+    return pair_count(len(arr))
+
 def test_nested_loops_processing():
     print("\n===== 入れ子になった2つのfor文での処理 =====")
     print("理論的計算量: O(n²)")
     print("理由: 外側のループがn回、内側のループがそれぞれn回実行されるため")
     
-    sizes = [100, 500, 1000, 2000]
+    # 実行時間の計測（入力サイズは時間の予算に収まる範囲で自動的に増やす）
+    points = adaptive_sweep(
+        lambda n: measure_step(nested_loops_processing, list(range(n))), start_n=100
+    )
+    sizes = sweep_sizes(points)
+    times = []
     
-    for size in sizes:
-        # テスト用の配列を作成
-        arr = list(range(size))
-        
-        # 実行時間の計測
-        result, execution_time = measure_time(nested_loops_processing, arr.copy())
+    for point in points:
+        size = point.n
+        result, execution_time = point.result
         
         print(f"配列サイズ {size} (処理回数 {result}): {execution_time:.8f} 秒")
+        times.append(execution_time)
+    
+    # tracemalloc は int を大量に作るループを数十倍遅くするため、メモリは最小のサイズでだけ計測する
+    # （この処理の確保量は入力サイズによらない）
+    memory = measure_memory(nested_loops_processing, setup=lambda: (list(range(sizes[0])),))
+    print(f"確保量（配列サイズ {sizes[0]}）: {format_bytes(memory.peak_bytes)}")
+    
+    # 処理回数は n² の式で求められる（ループを実行しない）
+    arr = list(range(sizes[-1]))
+    result, closed_form_time = measure_time(nested_loops_processing_closed_form, arr)
+    print(f"式で求めた場合（配列サイズ {sizes[-1]}、処理回数 {result}）: {closed_form_time:.8f} 秒")
+    
+    print_complexity_fit(sizes, times, expected="O(n²)")
 
 # ==== 配列要素へのアクセス（O(1)） ====
 def access_element(arr, index):
@@ -140,6 +273,7 @@ def test_access_element():
     print("理由: インデックスが分かっていれば、サイズに関わらず直接アクセスできるため")
     
     sizes = [1000, 10000, 100000, 1000000, 10000000]
+    times = []
     
     for size in sizes:
         # テスト用の配列を作成
@@ -147,13 +281,22 @@ def test_access_element():
         
         # 実行時間の計測
         _, execution_time = measure_time(access_element, arr, size // 2)
+        memory = measure_memory(access_element, (arr, size // 2))
         
-        print(f"配列サイズ {size}: {execution_time:.8f} 秒")
+        print(f"配列サイズ {size}: {execution_time:.8f} 秒、確保量 {format_bytes(memory.peak_bytes)}")
+        times.append(execution_time)
+    
+    print_complexity_fit(sizes, times, expected="O(1)", tolerance=1)
 
 # ==== メモリ使用量の計測 ====
 def measure_memory_usage(arr):
-    """配列のメモリ使用量を計測する（バイト単位）"""
-    return sys.getsizeof(arr)
+    """
+    配列のメモリ使用量を計測する（バイト単位）
+    
+    sys.getsizeof(arr) はリスト自体（要素への参照の配列）の大きさだけなので、
+    要素のオブジェクトも含めた大きさを deep_sizeof で求める。
+    """
+    return deep_sizeof(arr)
 
 def test_memory_usage():
     print("\n===== 配列のメモリ使用量 =====")
@@ -161,25 +304,47 @@ def test_memory_usage():
     sizes = [0, 10, 100, 1000, 10000, 100000, 1000000]
     
     for size in sizes:
-        # テスト用の配列を作成
-        arr = list(range(size))
+        # テスト用の配列を作成（作成時の確保量と RSS の増加も計測する）
+        memory = measure_memory(lambda: list(range(size)), name="list(range(size))")
+        arr = memory.result
         
         # メモリ使用量の計測
         memory_usage = measure_memory_usage(arr)
         
-        print(f"配列サイズ {size}: {memory_usage} バイト")
+        print(f"配列サイズ {size}: {memory_usage} バイト（リスト本体 {sys.getsizeof(arr)} バイト、"
+              f"作成時の確保量 {format_bytes(memory.peak_bytes)}、RSS の増加 {format_bytes(memory.rss_delta_bytes)}）")
+
+# ==== コンテナごとの比較 ====
+def test_container_comparison():
+    print("\n===== コンテナごとの実行時間とメモリの比較 =====")
+    print("list は要素ごとに int オブジェクトを持つが、array.array('q') と NumPy 配列は8バイトずつ詰めて持つ")
+    print("deque は両端への追加が O(1) だが、中央付近へのアクセスは O(n) になる")
+    
+    size = 100000
+    print(f"配列サイズ: {size}\n")
+    print_container_comparison(compare_containers(size))
 
 # メイン実行部分
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="様々な配列操作の計算量分析")
+    parser.add_argument("--json", help="計測結果を書き出す JSON ファイルのパス")
+    args = parser.parse_args()
+    
     print("様々な配列操作の計算量分析を開始します...")
     
     # 各操作のテスト
     test_insert_at_beginning()
+    test_insert_at_beginning_ring_buffer()
     test_append_to_end()
     test_double_all_elements()
+    test_double_all_elements_inplace()
     test_combine_arrays()
     test_nested_loops_processing()
     test_access_element()
     test_memory_usage()
+    test_container_comparison()
+    
+    if args.json:
+        write_json_report(args.json)
     
     print("\n分析が完了しました。")
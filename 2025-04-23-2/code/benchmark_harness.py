@@ -0,0 +1,308 @@
+# benchmark_harness.py
+# 計算量分析スクリプトで共通に使う実行時間の計測ツール
+
+import gc
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+# 1サンプルあたりの最小計測時間（これより短い関数は複数回まとめて実行して計測する）
+MIN_SAMPLE_TIME = 0.0002
+
+# 1つの関数の計測に使う時間の目安（秒）
+TIME_BUDGET = 0.5
+
+# サンプル数（計測の繰り返し回数）の下限と上限
+MIN_REPEAT = 3
+MAX_REPEAT = 100
+
+# このプロセスで計測した結果（JSON 出力用。関数の戻り値は含めない）
+_session_results = []
+
+class BenchmarkResult:
+    """
+    1つの関数の計測結果
+    
+    samples_ns には1回の呼び出しあたりの実行時間（ナノ秒）がサンプルごとに入ります。
+    """
+    
+    def __init__(self, name, params, samples_ns, number, result=None):
+        self.name = name
+        self.params = params
+        self.samples_ns = samples_ns
+        self.number = number
+        self.result = result
+    
+    @property
+    def repeat(self):
+        return len(self.samples_ns)
+    
+    @property
+    def min_ns(self):
+        return min(self.samples_ns)
+    
+    @property
+    def median_ns(self):
+        return _percentile(self.samples_ns, 50)
+    
+    @property
+    def p95_ns(self):
+        return _percentile(self.samples_ns, 95)
+    
+    @property
+    def mean_ns(self):
+        return sum(self.samples_ns) / len(self.samples_ns)
+    
+    @property
+    def min_seconds(self):
+        return self.min_ns / 1e9
+    
+    @property
+    def median_seconds(self):
+        return self.median_ns / 1e9
+    
+    def to_dict(self):
+        """JSON に書き出せる辞書に変換する（関数の戻り値は含めない）"""
+        return {
+            "name": self.name,
+            "params": self.params,
+            "number": self.number,
+            "repeat": self.repeat,
+            "min_ns": self.min_ns,
+            "median_ns": self.median_ns,
+            "p95_ns": self.p95_ns,
+            "mean_ns": self.mean_ns,
+            "samples_ns": self.samples_ns,
+        }
+    
+    def __repr__(self):
+        return (f"BenchmarkResult({self.name!r}, min={self.min_ns:.0f}ns, "
+                f"median={self.median_ns:.0f}ns, p95={self.p95_ns:.0f}ns, "
+                f"number={self.number}, repeat={self.repeat})")
+
+def _percentile(values, percent):
+    """線形補間によるパーセンタイル"""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return float(ordered[0])
+    position = (len(ordered) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    fraction = position - lower
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+
+def _describe_args(args, kwargs):
+    """引数の概要（配列は長さ、数値や短い文字列は値）を返す"""
+    def describe(value):
+        if isinstance(value, (bool, int, float)):
+            return value
+        if isinstance(value, str) and len(value) <= 40:
+            return value
+        if hasattr(value, "__len__"):
+            try:
+                return {"type": type(value).__name__, "len": len(value)}
+            except TypeError:
+                pass
+        return {"type": type(value).__name__}
+    
+    described = {f"arg{i}": describe(value) for i, value in enumerate(args)}
+    described.update({key: describe(value) for key, value in kwargs.items()})
+    return described
+
+def _time_calls(func, args, kwargs, number):
+    """func を number 回続けて実行し、合計時間（ナノ秒）と最後の戻り値を返す"""
+    result = None
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        result = func(*args, **kwargs)
+    return time.perf_counter_ns() - start, result
+
+def _calibrate(func, args, kwargs, min_sample_time):
+    """
+    1サンプルが min_sample_time 以上になる実行回数を求める（timeit の autorange と同じ方式）
+    
+    Returns:
+        tuple: (実行回数, そのときの1回あたりの時間（ナノ秒）)
+    """
+    min_sample_ns = min_sample_time * 1e9
+    number = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            count = number * multiplier
+            elapsed, _ = _time_calls(func, args, kwargs, count)
+            if elapsed >= min_sample_ns:
+                return count, elapsed / count
+        number *= 10
+
+def benchmark(func, args=(), kwargs=None, setup=None, name=None, warmup=1,
+              repeat=None, min_sample_time=MIN_SAMPLE_TIME, time_budget=TIME_BUDGET,
+              disable_gc=True):
+    """
+    関数の実行時間を計測する
+    
+    - time.perf_counter_ns() で計測する
+    - 最初に warmup 回だけ計測せずに実行する
+    - 短い関数は1サンプルが min_sample_time 以上になるようにまとめて実行する
+    - repeat を省略すると、time_budget に収まるサンプル数を自動で決める
+      （ウォームアップの1回だけで time_budget を超える場合は、その1回を唯一のサンプルにする）
+    - 計測中はガベージコレクションを止める
+    
+    Parameters:
+        func (callable): 計測する関数
+        args (tuple): func に渡す位置引数
+        kwargs (dict): func に渡すキーワード引数
+        setup (callable): 毎回の実行前に呼ぶ関数。戻り値のタプルを func の引数にする（計測には含めない）。
+                          入力を書き換える関数の計測に使い、この場合は1サンプル1回の実行になる
+        name (str): 結果の名前（省略時は関数名）
+        warmup (int): 計測前に実行する回数
+        repeat (int): サンプル数（省略時は自動）
+        min_sample_time (float): 1サンプルの最小計測時間（秒）
+        time_budget (float): サンプル数を自動で決めるときの計測時間の目安（秒）
+        disable_gc (bool): 計測中にガベージコレクションを止めるかどうか
+    
+    Returns:
+        BenchmarkResult: 計測結果（result に関数の戻り値が入る）
+    """
+    kwargs = kwargs or {}
+    name = name or getattr(func, "__name__", repr(func))
+    
+    def prepare():
+        return setup() if setup is not None else args
+    
+    # ウォームアップ（1回あたりの時間の見積もりにも使う）
+    estimate_ns = None
+    for _ in range(warmup):
+        call_args = prepare()
+        elapsed, result = _time_calls(func, call_args, kwargs, 1)
+        estimate_ns = elapsed
+    
+    # 1回で予算を使い切る関数は、同じ時間をかけて繰り返しても精度はほとんど変わらないため、
+    # ウォームアップの1回を計測結果とする（大きな入力サイズでの計測の時間を数分の1にする）
+    if repeat is None and estimate_ns is not None and estimate_ns >= time_budget * 1e9:
+        params = _describe_args(args if setup is None else call_args, kwargs)
+        return _record(BenchmarkResult(name, params, [estimate_ns], 1, result))
+    
+    if setup is None:
+        number, estimate_ns = _calibrate(func, args, kwargs, min_sample_time)
+    else:
+        number = 1
+        if estimate_ns is None:
+            elapsed, _ = _time_calls(func, prepare(), kwargs, 1)
+            estimate_ns = elapsed
+    
+    if repeat is None:
+        sample_ns = max(estimate_ns * number, 1)
+        repeat = int(time_budget * 1e9 // sample_ns)
+        repeat = max(MIN_REPEAT, min(MAX_REPEAT, repeat))
+    
+    # 計測前に一度だけ回収し、計測中はガベージコレクションを止める
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    if disable_gc:
+        gc.disable()
+    samples_ns = []
+    result = None
+    try:
+        for _ in range(repeat):
+            call_args = prepare()
+            elapsed, result = _time_calls(func, call_args, kwargs, number)
+            samples_ns.append(elapsed / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    
+    params = _describe_args(args if setup is None else call_args, kwargs)
+    return _record(BenchmarkResult(name, params, samples_ns, number, result))
+
+def _record(benchmark_result):
+    """
+    計測結果をこのプロセスの結果の一覧に加えて返す
+    
+    一覧には戻り値を除いた計測値だけを残します。戻り値（大きな配列など）を一覧が参照し続けると、
+    呼び出し側が使い終わってもプロセスが終わるまで解放されないためです。
+    """
+    _session_results.append(BenchmarkResult(
+        benchmark_result.name, benchmark_result.params, benchmark_result.samples_ns, benchmark_result.number,
+    ))
+    return benchmark_result
+
+def measure_time(func, *args, **kwargs):
+    """
+    関数の実行時間を計測する
+    
+    Returns:
+        tuple: (関数の戻り値, 1回あたりの実行時間の最小値（秒）)
+    """
+    result = benchmark(func, args, kwargs)
+    return result.result, result.min_seconds
+
+def session_results():
+    """このプロセスで計測した結果の一覧を返す（result は常に None）"""
+    return list(_session_results)
+
+def clear_session():
+    """記録した計測結果を消去する"""
+    del _session_results[:]
+
+def _git_commit():
+    """現在の git のコミット（取得できない場合は None）"""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+def environment_info():
+    """異なるマシン・コミット間で結果を比較するための実行環境の情報"""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": _git_commit(),
+    }
+
+def build_report(results=None):
+    """計測結果を JSON に書き出せる辞書にまとめる"""
+    if results is None:
+        results = _session_results
+    return {
+        "environment": environment_info(),
+        "results": [result.to_dict() for result in results],
+    }
+
+def write_json_report(path, results=None):
+    """
+    計測結果を JSON ファイルに書き出す
+    
+    Parameters:
+        path (str): 出力ファイルのパス
+        results (list): BenchmarkResult のリスト（省略時はこのプロセスで計測したすべての結果）
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(build_report(results), f, ensure_ascii=False, indent=2)
+    print(f"計測結果を '{path}' に書き出しました")
+
+if __name__ == "__main__":
+    # 定数時間の操作でも意味のある値が得られることを確認する
+    arr = list(range(1000000))
+    result = benchmark(lambda: arr[500000], name="access_element")
+    print(result)
+    print(f"min: {result.min_ns:.1f} ns、median: {result.median_ns:.1f} ns、p95: {result.p95_ns:.1f} ns")
+    
+    # 戻り値は呼び出し側にだけ返し、記録した結果には残さない
+    assert result.result == 500000
+    assert session_results()[-1].result is None
+    print(json.dumps(build_report(), ensure_ascii=False, indent=2)[:400])
@@ -0,0 +1,261 @@
+# benchmark_suite.py
+# 計算量分析スクリプトの test_* シナリオをまとめて実行し、各シナリオが計測した関数の時間を保存した基準値と比較する
+
+import argparse
+import contextlib
+import importlib
+import inspect
+import io
+import json
+import os
+import sys
+import time
+
+from benchmark_harness import environment_info, session_results
+
+# シナリオを探すモジュール
+SCENARIO_MODULES = [
+    "array_operations_complexity",
+    "linear_search_analysis",
+    "mystery_function_analysis",
+]
+
+# 基準値ファイルの既定のパス
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# 基準値よりこの割合以上遅くなったら失敗とする
+DEFAULT_THRESHOLD = 0.2
+
+# 基準値との差がこれ未満（ナノ秒）なら、比率が大きくても計測の誤差として扱う
+# （100 ns 程度の関数では、タイマーの分解能と呼び出しのばらつきだけで 20% 前後変わるため）
+NOISE_FLOOR_NS = 50
+
+def discover_scenarios(module_names=None, keyword=None):
+    """
+    モジュール内の test_* 関数をシナリオとして集める
+    
+    Parameters:
+        module_names (list): 探索するモジュール名（省略時は SCENARIO_MODULES）
+        keyword (str): シナリオ名に含まれる文字列で絞り込む（省略可）
+    
+    Returns:
+        list: (シナリオ名, 関数) のリスト（モジュール内で定義された順）
+    """
+    scenarios = []
+    for module_name in module_names or SCENARIO_MODULES:
+        module = importlib.import_module(module_name)
+        functions = [
+            function for name, function in inspect.getmembers(module, inspect.isfunction)
+            if name.startswith("test_") and function.__module__ == module.__name__
+        ]
+        functions.sort(key=lambda function: function.__code__.co_firstlineno)
+        for function in functions:
+            name = f"{module_name}.{function.__name__}"
+            if keyword is None or keyword in name:
+                scenarios.append((name, function))
+    return scenarios
+
+class ScenarioRun:
+    """
+    1つのシナリオの実行結果
+    
+    measurements にはシナリオの中で benchmark_harness が計測した関数ごとの結果が
+    {計測の名前: {"min_ns", "median_ns", "p95_ns"}} の形で入ります（measurement_key を参照）。
+    seconds はシナリオ全体の実行時間で、並列実行の投入順の目安にだけ使います。
+    シナリオは時間の予算に合わせて入力サイズを決めるため、全体の時間は性能の判定に使えません。
+    failure にはシナリオの中の assert（計算量の確認など）が失敗したときのメッセージが入ります。
+    """
+    
+    def __init__(self, name, seconds, measurements, failure=None):
+        self.name = name
+        self.seconds = seconds
+        self.measurements = measurements
+        self.failure = failure
+    
+    def __repr__(self):
+        return f"ScenarioRun({self.name!r}, {self.seconds:.3f}s, {len(self.measurements)} measurements)"
+
+def measurement_key(scenario, result):
+    """基準値と比較する計測の名前（シナリオ名、関数名、引数の概要）"""
+    params = json.dumps(result.params, sort_keys=True, ensure_ascii=False)
+    return f"{scenario}::{result.name}{params}"
+
+def run_scenario(name, function, repeat=3):
+    """
+    シナリオを repeat 回実行し、その中で計測された関数ごとの結果を集める（シナリオの出力は表示しない）
+    
+    同じ計測が複数回ある場合は min_ns・median_ns は最小値、p95_ns は最大値を残します。
+    シナリオの assert が失敗した場合は、そこで実行をやめて failure にメッセージを入れます。
+    
+    Returns:
+        ScenarioRun: 実行結果
+    """
+    measurements = {}
+    failure = None
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        first = len(session_results())
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                function()
+        except AssertionError as error:
+            failure = str(error) or "assert が失敗しました"
+        for result in session_results()[first:]:
+            key = measurement_key(name, result)
+            previous = measurements.get(key)
+            current = {"min_ns": result.min_ns, "median_ns": result.median_ns, "p95_ns": result.p95_ns}
+            if previous is not None:
+                current = {
+                    "min_ns": min(previous["min_ns"], current["min_ns"]),
+                    "median_ns": min(previous["median_ns"], current["median_ns"]),
+                    "p95_ns": max(previous["p95_ns"], current["p95_ns"]),
+                }
+            measurements[key] = current
+        if failure is not None:
+            break
+    seconds = (time.perf_counter() - start_time) / max(repeat, 1)
+    return ScenarioRun(name, seconds, measurements, failure)
+
+def load_baseline(path):
+    """基準値ファイルを読み込む（存在しない場合は None）"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_baseline(path, runs, previous=None):
+    """
+    実行結果を基準値ファイルに保存する
+    
+    関数ごとの計測（measurements）と、投入順の目安にするシナリオ全体の時間（scenarios）を保存する。
+    previous（以前の基準値）にあって今回実行しなかったシナリオの値はそのまま残す。
+    """
+    previous = previous or {}
+    names = {run.name for run in runs}
+    scenarios = {name: value for name, value in previous.get("scenarios", {}).items() if name not in names}
+    measurements = {
+        key: value for key, value in previous.get("measurements", {}).items()
+        if key.split("::", 1)[0] not in names
+    }
+    for run in runs:
+        scenarios[run.name] = {"seconds": run.seconds}
+        measurements.update({
+            key: {"min_ns": value["min_ns"], "median_ns": value["median_ns"]}
+            for key, value in run.measurements.items()
+        })
+    baseline = {
+        "environment": environment_info(),
+        "scenarios": scenarios,
+        "measurements": measurements,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+
+def compare_with_baseline(runs, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    シナリオの中で計測した関数ごとの結果を基準値と比較する
+    
+    同じ名前・同じ引数の計測の最小実行時間を比べ、基準値の (1 + threshold) 倍を超えたものを「遅延」とします。
+    差が NOISE_FLOOR_NS 未満の場合は、比率に関係なく「OK」とします。
+    入力サイズを時間の予算で決めるシナリオでは、大きいサイズの計測が基準値にない（「新規」になる）ことがあります。
+    
+    Returns:
+        list: (計測の名前, 基準値（ns）, 今回（ns）, 比率, 判定) のリスト
+              判定は "OK"、"遅延"、"高速化"、"新規" のいずれか
+    """
+    references = baseline.get("measurements", {}) if baseline else {}
+    rows = []
+    for run in runs:
+        for key, measurement in run.measurements.items():
+            current_ns = measurement["min_ns"]
+            reference = references.get(key)
+            if reference is None:
+                rows.append((key, None, current_ns, None, "新規"))
+                continue
+            ratio = current_ns / reference["min_ns"] if reference["min_ns"] else float("inf")
+            if abs(current_ns - reference["min_ns"]) < NOISE_FLOOR_NS:
+                status = "OK"
+            elif ratio > 1 + threshold:
+                status = "遅延"
+            elif ratio < 1 / (1 + threshold):
+                status = "高速化"
+            else:
+                status = "OK"
+            rows.append((key, reference["min_ns"], current_ns, ratio, status))
+    return rows
+
+def unmeasured_scenarios(runs):
+    """benchmark_harness で何も計測しなかった（判定の対象にならない）シナリオの名前"""
+    return [run.name for run in runs if not run.measurements]
+
+def print_failures(runs):
+    """
+    assert が失敗したシナリオを表示する
+    
+    Returns:
+        list: 失敗したシナリオの ScenarioRun
+    """
+    failed = [run for run in runs if run.failure is not None]
+    if failed:
+        print(f"\n{len(failed)} 件のシナリオが失敗しました:")
+        for run in failed:
+            print(f"  {run.name}: {run.failure}")
+    return failed
+
+def print_comparison(rows):
+    """比較結果を表形式で表示する"""
+    print(f"{'基準値(秒)':>14} {'今回(秒)':>14} {'比率':>8}  {'判定':<4}  計測")
+    print("-" * 100)
+    for name, reference_ns, current_ns, ratio, status in rows:
+        reference = f"{reference_ns / 1e9:.8f}" if reference_ns is not None else "-"
+        change = f"{ratio:.2f}x" if ratio is not None else "-"
+        print(f"{reference:>14} {current_ns / 1e9:>14.8f} {change:>8}  {status:<4}  {name}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="計算量分析シナリオの性能回帰チェック")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基準値ファイルのパス")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="失敗とする遅延の割合（0.2 なら 20%%）")
+    parser.add_argument("--repeat", type=int, default=3, help="各シナリオの実行回数")
+    parser.add_argument("-k", "--keyword", help="シナリオ名に含まれる文字列で絞り込む")
+    parser.add_argument("--update", action="store_true", help="今回の結果で基準値を更新する")
+    args = parser.parse_args(argv)
+    
+    scenarios = discover_scenarios(keyword=args.keyword)
+    if not scenarios:
+        print("対象のシナリオがありません")
+        return 1
+    
+    runs = []
+    for name, function in scenarios:
+        print(f"実行中: {name}", file=sys.stderr)
+        runs.append(run_scenario(name, function, args.repeat))
+    
+    baseline = load_baseline(args.baseline)
+    rows = compare_with_baseline(runs, baseline, args.threshold)
+    print_comparison(rows)
+    unmeasured = unmeasured_scenarios(runs)
+    if unmeasured:
+        print(f"\n関数の計測がないため判定の対象外のシナリオ: {', '.join(unmeasured)}")
+    
+    # 計算量の確認などが失敗した結果は、基準値として保存しない
+    if print_failures(runs):
+        return 1
+    
+    if args.update or baseline is None:
+        save_baseline(args.baseline, runs, baseline)
+        print(f"\n基準値を '{args.baseline}' に保存しました")
+        return 0
+    
+    regressions = [row for row in rows if row[4] == "遅延"]
+    if regressions:
+        print(f"\n{len(regressions)} 件の計測が基準値より {args.threshold:.0%} 以上遅くなりました:")
+        for name, reference_ns, current_ns, ratio, _ in regressions:
+            print(f"  {name}: {reference_ns / 1e9:.8f} 秒 → {current_ns / 1e9:.8f} 秒（{ratio:.2f}倍）")
+        return 1
+    
+    print("\n性能の劣化はありませんでした")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
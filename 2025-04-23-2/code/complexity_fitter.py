@@ -0,0 +1,274 @@
+# complexity_fitter.py
+# 計測した (n, 実行時間) や (n, 操作回数) から計算量のクラスを推定する
+
+import math
+
+# 候補となる計算量のモデル（time_complexity_visualizer.plot_time_complexities と同じ7種類）
+# 単純なものから順に並べる（同程度に当てはまる場合は単純な方を選ぶ）
+MODELS = [
+    ("O(1)", lambda n: 1.0),
+    ("O(log n)", lambda n: math.log2(n)),
+    ("O(n)", lambda n: float(n)),
+    ("O(n log n)", lambda n: n * math.log2(n)),
+    ("O(n²)", lambda n: float(n) ** 2),
+    ("O(n³)", lambda n: float(n) ** 3),
+    ("O(2^n)", lambda n: 2.0 ** n),
+]
+
+MODEL_LABELS = [label for label, _ in MODELS]
+
+# 各モデルの両対数グラフでの傾き（多項式の次数。対数の因子は無視する）
+MODEL_EXPONENTS = {
+    "O(1)": 0.0,
+    "O(log n)": 0.0,
+    "O(n)": 1.0,
+    "O(n log n)": 1.0,
+    "O(n²)": 2.0,
+    "O(n³)": 3.0,
+    "O(2^n)": math.inf,
+}
+
+# 誤差の差がこの割合以内なら、単純な方のモデルを選ぶ
+SIMPLICITY_MARGIN = 0.1
+
+# 最大の n で b·f(n) の寄与がこの割合未満のモデルは、実質的に定数とみなす
+DEGENERATE_CONTRIBUTION = 0.05
+
+# assert_complexity で、想定より大きいクラスをこの信頼度以上で推定したときだけ失敗とする
+MIN_CONFIDENCE = 0.3
+
+# assert_complexity で、両対数の傾きが許容するクラスの次数をこの値以上超えたときだけ失敗とする
+EXPONENT_MARGIN = 0.5
+
+class ComplexityFit:
+    """
+    計算量クラスの推定結果
+    
+    y ≈ a + b·f(n) の形で当てはめ、相対誤差の二乗平均平方根（error）が最小のモデルを選びます。
+    confidence は 0〜1 の値で、2番目に良いモデルとの誤差の差が大きく、
+    かつ誤差そのものが小さいほど 1 に近づきます。
+    """
+    
+    def __init__(self, label, a, b, error, confidence, ranking, exponent):
+        self.label = label
+        self.a = a
+        self.b = b
+        self.error = error
+        self.confidence = confidence
+        self.ranking = ranking
+        self.exponent = exponent
+    
+    def predict(self, n):
+        """推定したモデルで n のときの値を予測する"""
+        return self.a + self.b * dict(MODELS)[self.label](n)
+    
+    def __repr__(self):
+        return (f"ComplexityFit({self.label}, a={self.a:.3g}, b={self.b:.3g}, "
+                f"error={self.error:.3f}, confidence={self.confidence:.2f})")
+
+def _fit_model(xs, ys, weights):
+    """
+    重み付き最小二乗法で y ≈ a + b·x を求める（a >= 0、b >= 0 に制限する）
+    
+    Returns:
+        tuple: (a, b)
+    """
+    sw = sum(weights)
+    sx = sum(w * x for w, x in zip(weights, xs))
+    sy = sum(w * y for w, y in zip(weights, ys))
+    sxx = sum(w * x * x for w, x in zip(weights, xs))
+    sxy = sum(w * x * y for w, x, y in zip(weights, xs, ys))
+    
+    determinant = sw * sxx - sx * sx
+    if determinant > 0:
+        b = (sw * sxy - sx * sy) / determinant
+        a = (sy - b * sx) / sw
+        if a >= 0 and b >= 0:
+            return a, b
+    
+    # 制約を満たさない場合は、片方だけのモデルで当てはめ直して良い方を選ぶ
+    candidates = [(sy / sw if sw else 0.0, 0.0)]
+    if sxx > 0:
+        candidates.append((0.0, max(0.0, sxy / sxx)))
+    return min(candidates, key=lambda ab: _weighted_error(xs, ys, weights, *ab))
+
+def _weighted_error(xs, ys, weights, a, b):
+    return sum(w * (y - a - b * x) ** 2 for w, x, y in zip(weights, xs, ys))
+
+def _loglog_exponent(ns, ys):
+    """両対数グラフでの傾き（多項式の次数の目安）"""
+    points = [(math.log(n), math.log(y)) for n, y in zip(ns, ys) if n > 0 and y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    if sxx == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / sxx
+
+def fit_complexity(ns, ys, models=None):
+    """
+    計測結果に最もよく当てはまる計算量のモデルを推定する
+    
+    すべて同じ値の系列（すべて 0 の操作回数など）は、信頼度 1 の O(1) とします。
+    
+    Parameters:
+        ns (list): 入力サイズ
+        ys (list): 実行時間または操作回数
+        models (list): 候補のモデル名（省略時は MODEL_LABELS のすべて）
+    
+    Returns:
+        ComplexityFit: 推定結果
+    """
+    if len(ns) != len(ys):
+        raise ValueError("ns と ys の長さが一致しません")
+    if len(ns) < 3:
+        raise ValueError("計算量を推定するには3点以上の計測結果が必要です")
+    if min(ns) < 1:
+        raise ValueError("入力サイズは1以上である必要があります")
+    if min(ys) < 0:
+        raise ValueError("計測値は0以上である必要があります")
+    
+    labels = models or MODEL_LABELS
+    model_functions = dict(MODELS)
+    
+    # すべて同じ値（すべて 0 を含む）の系列は定数。相対誤差の重みが定義できないため、当てはめずに返す
+    if min(ys) == max(ys):
+        return ComplexityFit(
+            "O(1)", float(ys[0]), 0.0, 0.0, 1.0,
+            [("O(1)", 0.0)], 0.0 if ys[0] > 0 else None,
+        )
+    
+    # 計測値が数桁にわたるため、相対誤差で評価する
+    # 最大値を 1 にそろえてから重みを求め、ごく小さい値でも重みの計算で桁あふれしないようにする
+    scale = max(ys)
+    values = [y / scale for y in ys]
+    weights = [1.0 / max(y, 1e-12) ** 2 for y in values]
+    
+    results = []
+    candidates = []
+    for label in labels:
+        function = model_functions[label]
+        try:
+            xs = [function(n) for n in ns]
+        except OverflowError:
+            continue  # 2^n など、値が大きすぎて評価できないモデル
+        if any(math.isinf(x) for x in xs):
+            continue
+        
+        if label == "O(1)":
+            a, b = sum(w * y for w, y in zip(weights, values)) / sum(weights), 0.0
+        else:
+            a, b = _fit_model(xs, values, weights)
+        error = math.sqrt(_weighted_error(xs, values, weights, a, b) / len(ns))
+        results.append((label, a, b, error))
+        
+        # 成長する項がほとんど効いていない当てはめは、定数と区別できないため候補から外す
+        growth = b * max(xs)
+        if label != "O(1)" and growth < DEGENERATE_CONTRIBUTION * (a + growth):
+            continue
+        candidates.append((label, a, b, error))
+    
+    if not candidates:
+        candidates = results
+    ranking = sorted(results, key=lambda result: result[3])
+    best = min(candidates, key=lambda result: result[3])
+    # 単純なモデルの誤差が最良とほとんど変わらなければ、そちらを選ぶ
+    for candidate in sorted(candidates, key=lambda result: labels.index(result[0])):
+        if candidate[3] <= best[3] * (1 + SIMPLICITY_MARGIN) + 1e-12:
+            best = candidate
+            break
+    
+    others = [result[3] for result in candidates if result[0] != best[0]]
+    if not others:
+        separation = 1.0  # 他のモデルがすべて定数に退化した場合
+    elif min(others) > 0:
+        separation = 1.0 - best[3] / min(others)
+    else:
+        separation = 0.0
+    confidence = max(0.0, separation) * max(0.0, 1.0 - best[3])
+    
+    label, a, b, error = best
+    return ComplexityFit(
+        label, a * scale, b * scale, error, confidence,
+        [(result[0], result[3]) for result in ranking],
+        _loglog_exponent(ns, ys),
+    )
+
+def is_worse_than(label, expected):
+    """label の計算量クラスが expected より大きいかどうか"""
+    return MODEL_LABELS.index(label) > MODEL_LABELS.index(expected)
+
+def _check_complexity(fit, expected, min_confidence, tolerance):
+    """
+    推定したクラスが expected より tolerance 段階を超えて大きく、信頼度が min_confidence 以上で、
+    両対数の傾きも許容するクラスの次数を EXPONENT_MARGIN 以上超えている場合に AssertionError を送出する
+    
+    ほぼ一定の系列で最後の点だけが遅い（キャッシュに収まらなくなったなど）場合、
+    a + b·n³ が最もよく当てはまることがありますが、傾きは 0 に近いため失敗にしません。
+    """
+    allowed = MODEL_LABELS[min(MODEL_LABELS.index(expected) + tolerance, len(MODEL_LABELS) - 1)]
+    grows_faster = fit.exponent is None or fit.exponent > MODEL_EXPONENTS[allowed] + EXPONENT_MARGIN
+    if is_worse_than(fit.label, allowed) and fit.confidence >= min_confidence and grows_faster:
+        raise AssertionError(
+            f"計算量が {allowed} を超えています: 推定 {fit.label}（信頼度 {fit.confidence:.2f}、理論値 {expected}）"
+        )
+
+def assert_complexity(ns, ys, expected, min_confidence=MIN_CONFIDENCE, tolerance=0):
+    """
+    計測結果の計算量が expected 以下であることを確認する
+    
+    推定したクラスが expected より大きく、信頼度が min_confidence 以上の場合に
+    AssertionError を送出します（例: O(n) のはずの処理が O(n²) になった場合）。
+    実行時間はキャッシュの影響などで1段階上のクラス（O(n) が O(n log n) など）に見えることがあるため、
+    tolerance で expected より何段階上までを許容するかを指定できます。
+    
+    Returns:
+        ComplexityFit: 推定結果
+    """
+    fit = fit_complexity(ns, ys)
+    _check_complexity(fit, expected, min_confidence, tolerance)
+    return fit
+
+def print_complexity_fit(ns, ys, title="推定計算量", expected=None, min_confidence=MIN_CONFIDENCE, tolerance=0):
+    """
+    推定結果を表示する
+    
+    expected を指定すると、表示したあとに assert_complexity と同じ確認を行います。
+    test_* シナリオは理論的な計算量を expected に渡すため、benchmark_suite でシナリオを実行すると
+    計算量のクラスが悪化した（O(n) が O(n²) になったなど）場合に失敗します。
+    """
+    fit = fit_complexity(ns, ys)
+    exponent = f"、両対数の傾き {fit.exponent:.2f}" if fit.exponent is not None else ""
+    print(f"{title}: {fit.label}（信頼度 {fit.confidence:.2f}、相対誤差 {fit.error:.3f}{exponent}）")
+    if expected is not None:
+        _check_complexity(fit, expected, min_confidence, tolerance)
+    return fit
+
+if __name__ == "__main__":
+    sizes = [100, 200, 400, 800, 1600, 3200]
+    examples = {
+        "定数": [5.0 for n in sizes],
+        "線形": [3.0 * n + 10 for n in sizes],
+        "線形対数": [2.0 * n * math.log2(n) for n in sizes],
+        "二次": [0.5 * n * n + n for n in sizes],
+        "三次": [0.01 * n ** 3 for n in sizes],
+    }
+    for name, values in examples.items():
+        print_complexity_fit(sizes, values, f"{name}のデータ")
+    
+    # すべて同じ値（すべて 0 を含む）の系列は O(1)
+    assert fit_complexity(sizes, [0] * len(sizes)).label == "O(1)"
+    assert fit_complexity(sizes, [1e-320] * len(sizes)).label == "O(1)"
+    
+    # O(n) のはずの処理が O(n²) になった場合は、1段階の許容があっても失敗する
+    assert_complexity(sizes, examples["線形対数"], "O(n)", tolerance=1)
+    # ほぼ一定で最後の点だけが遅い系列は、O(n³) が当てはまっても O(1) の確認を通る
+    assert_complexity(sizes, [2.0e-7, 2.1e-7, 2.0e-7, 2.2e-7, 2.9e-7, 6.0e-7], "O(1)", tolerance=1)
+    try:
+        assert_complexity(sizes, examples["二次"], "O(n)", tolerance=1)
+    except AssertionError as error:
+        print(f"検出: {error}")
+    else:
+        raise AssertionError("O(n²) の系列が O(n) の確認を通りました")
@@ -0,0 +1,96 @@
+# concat_view.py
+# 複数の配列をコピーせずに、1つにつながった配列として扱うビュー
+
+import bisect
+import itertools
+
+class ConcatView:
+    """
+    複数のシーケンスを連結したように見せるビュー（要素はコピーしない）
+    
+    arr1 + arr2 は n + m 個の要素をコピーする O(n + m) の操作ですが、
+    ConcatView(arr1, arr2) の作成は配列の数 k に比例する時間で済みます。
+    
+    - len(): O(1)
+    - 添字でのアクセス: O(log k)（各配列の開始位置を二分探索する）
+    - スライス: O(1)。元の配列を参照したままの新しいビューを返す
+    - 反復: コピーせずに各配列を順にたどる
+    - materialize(): 実際の list が必要な場合に O(n + m) でコピーを作る
+    
+    元の配列を後から変更した場合、長さの変化はビューに反映されません。
+    
+    Parameters:
+        sequences: 連結するシーケンス（list、array.array、NumPy 配列など len と添字に対応するもの）
+    """
+    
+    def __init__(self, *sequences):
+        self._parts = sequences
+        # _starts[i] は i 番目の配列の先頭が全体の何番目か（最後の要素は全体の長さ）
+        self._starts = [0]
+        for part in sequences:
+            self._starts.append(self._starts[-1] + len(part))
+        # 全体のうちこのビューが見せる位置（スライスで絞り込む）
+        self._window = range(self._starts[-1])
+    
+    def _locate(self, position):
+        """全体での位置を (配列の番号, 配列内の位置) に変換する"""
+        part = bisect.bisect_right(self._starts, position) - 1
+        return part, position - self._starts[part]
+    
+    def __len__(self):
+        return len(self._window)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            view = ConcatView.__new__(ConcatView)
+            view._parts = self._parts
+            view._starts = self._starts
+            view._window = self._window[index]
+            return view
+        part, offset = self._locate(self._window[index])
+        return self._parts[part][offset]
+    
+    def __iter__(self):
+        window = self._window
+        if window.step != 1:
+            return (self[i] for i in range(len(window)))
+        if len(window) == 0:
+            return iter(())
+        # 連続した範囲は、各配列の該当部分を順にたどる
+        first, _ = self._locate(window.start)
+        last, _ = self._locate(window.stop - 1)
+        return itertools.chain.from_iterable(
+            self._iter_part(part, window.start, window.stop) for part in range(first, last + 1)
+        )
+    
+    def _iter_part(self, part, start, stop):
+        """part 番目の配列のうち、全体での位置が [start, stop) の部分をたどる"""
+        sequence = self._parts[part]
+        begin = max(start - self._starts[part], 0)
+        end = min(stop, self._starts[part + 1]) - self._starts[part]
+        if begin == 0 and end == len(sequence):
+            return iter(sequence)
+        return map(sequence.__getitem__, range(begin, end))
+    
+    def materialize(self):
+        """ビューの要素を新しい list にコピーする"""
+        window = self._window
+        if window.step == 1 and window.start == 0 and window.stop == self._starts[-1]:
+            result = []
+            for part in self._parts:
+                result.extend(part)
+            return result
+        return list(self)
+    
+    def __repr__(self):
+        return f"ConcatView({self.materialize()!r})"
+
+def combine_arrays_view(arr1, arr2):
+    """2つの配列をコピーせずに結合する（O(1)）"""
+    return ConcatView(arr1, arr2)
+
+if __name__ == "__main__":
+    view = ConcatView([1, 2, 3], [4, 5], [6, 7, 8, 9])
+    print(view, len(view), view[3], view[-1])
+    print(view[2:7], view[::3], view[::-1][1:3].materialize())
+    print(sum(view), list(view[1:8]))
@@ -0,0 +1,226 @@
+# inplace_map.py
+# 配列の各要素に変換を適用し、新しい配列を作らずに元の配列へ書き戻す
+
+import array
+
+from lazy_import import is_loaded, lazy_module
+
+# NumPy は最初に使うときに読み込む（ない環境では None になり、Python のループで変換する）
+np = lazy_module("numpy")
+
+# 一度に変換する要素数（int64 で 8MB）
+CHUNK_ELEMENTS = 1 << 20
+
+def _is_ufunc(transform):
+    return is_loaded(np) and isinstance(transform, np.ufunc)
+
+def _map_ndarray(data, transform, operands, chunk_size):
+    """
+    NumPy 配列を ufunc で変換する（out= に元の配列を渡すため、一時的な配列を作らない）
+    
+    np.memmap では chunk_size 要素ずつ変換して flush し、
+    書き込み済みのページをファイルに戻して OS が回収できるようにする。
+    """
+    if not isinstance(data, np.memmap) or not data.flags.c_contiguous:
+        transform(data, *operands, out=data)
+        return data
+    
+    flat = data.reshape(-1)
+    for start in range(0, flat.size, chunk_size):
+        block = flat[start:start + chunk_size]
+        transform(block, *operands, out=block)
+        data.flush()
+    return data
+
+def _map_buffer(data, transform, operands):
+    """
+    array.array の領域を NumPy 配列として参照し、ufunc で変換する（コピーしない）
+    
+    結果は元の型に収まるように書き込まれるため、整数の桁あふれは検出されない（NumPy と同じ）。
+    """
+    view = np.frombuffer(data, dtype=data.typecode)
+    transform(view, *operands, out=view)
+    return data
+
+# list の整数をまとめて変換できる範囲（int64）
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+# 整数の結果がこの大きさ未満なら int64 で桁あふれしていない（float64 で求めた値の誤差を見込んだ余裕を取る）
+_INT64_SAFE_LIMIT = float(1 << 62)
+
+def _exact_dtype(values):
+    """
+    値をそのまま NumPy 配列にしても結果が変わらない場合の型（できなければ None）
+    
+    すべてが int64 に収まる int、またはすべてが float の場合だけ変換できる。
+    bool や str、int と float の混在（int が float になる）などは None を返す。
+    """
+    kinds = set(map(type, values))
+    if kinds == {int}:
+        return np.int64 if _INT64_MIN <= min(values) and max(values) <= _INT64_MAX else None
+    if kinds == {float}:
+        return np.float64
+    return None
+
+def _transform_exact(values, transform, operands):
+    """
+    values を NumPy でまとめて変換する（Python で1要素ずつ変換した場合と結果が同じになる場合だけ）
+    
+    Returns:
+        list: 変換した値（Python の int / float）。まとめて変換できない場合は None
+    """
+    dtype = _exact_dtype(values)
+    if dtype is None or (operands and _exact_dtype(operands) is None):
+        return None
+    block = np.array(values, dtype=dtype)
+    try:
+        result = transform(block, *operands)
+        if result.dtype.kind in "iu":
+            # 整数の桁あふれは NumPy では検出されないため、float64 で求めた値の大きさで確かめる
+            with np.errstate(all="ignore"):
+                estimate = transform(block.astype(np.float64), *operands)
+            if not np.all(np.abs(estimate) < _INT64_SAFE_LIMIT):
+                return None
+    except TypeError:  # ufunc がこの型に対応していない
+        return None
+    return result.tolist()
+
+def _map_list(data, transform, operands, chunk_size, fallback):
+    """
+    list を chunk_size 要素ずつ NumPy 配列に変換して ufunc を適用し、書き戻す
+    
+    一時的に必要なメモリは1つのチャンク分だけで、要素は Python の int / float に戻る。
+    int64 に収まる int だけ、または float だけのチャンクに限り NumPy で変換し、
+    それ以外（大きな整数、桁あふれする結果、bool、str、int と float の混在など）のチャンクは
+    fallback で1要素ずつ変換する（Python で変換した場合と同じ結果になる）。
+    list と NumPy 配列の間の変換に時間がかかるため、速さが必要な処理では array.array や NumPy 配列で持つ方がよい。
+    """
+    for start in range(0, len(data), chunk_size):
+        chunk = data[start:start + chunk_size]
+        result = _transform_exact(chunk, transform, operands)
+        if result is None:
+            for i in range(start, start + len(chunk)):
+                data[i] = fallback(data[i])
+        else:
+            data[start:start + len(chunk)] = result
+    return data
+
+def _ufunc_per_element(transform, operands):
+    """ufunc を1要素ずつ適用する関数（NumPy の数値は Python の値に戻す）"""
+    def apply(value):
+        result = transform(value, *operands)
+        return result.item() if isinstance(result, np.generic) else result
+    return apply
+
+def map_inplace(data, transform, *operands, chunk_size=CHUNK_ELEMENTS, fallback=None):
+    """
+    配列の各要素を transform で変換し、結果を同じ配列に書き込む
+    
+    transform には NumPy の ufunc（例: np.multiply）か、1要素を受け取る Python の関数を渡します。
+    ufunc の場合は operands を追加の引数として渡します（例: map_inplace(arr, np.multiply, 2)）。
+    
+    - NumPy 配列（np.memmap を含む）: ufunc に out= を渡して書き換える（memmap はチャンクごと）
+    - array.array: 領域を NumPy 配列として参照して書き換える
+    - list: チャンクごとに NumPy で変換して書き戻す（結果が変わる要素を含むチャンクは fallback で変換する）
+    - Python の関数の場合や NumPy がない場合: 添字で1要素ずつ書き換える
+    
+    Parameters:
+        data: 変換する配列（list、array.array、NumPy 配列など、添字で代入できるもの）
+        transform: NumPy の ufunc、または Python の関数
+        operands: ufunc に渡す追加の引数
+        chunk_size (int): 一度に変換する要素数
+        fallback (callable): list を NumPy で変換できない場合に1要素ずつ使う Python の関数
+                             （省略時は ufunc を1要素ずつ適用する）
+    
+    Returns:
+        data（書き換えた同じ配列）
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size は1以上である必要があります")
+    
+    if _is_ufunc(transform):
+        if isinstance(data, np.ndarray):
+            return _map_ndarray(data, transform, operands, chunk_size)
+        # Unicode 文字の配列（'u'、'w'）は数値として読み替えないよう、汎用の経路で変換する
+        if isinstance(data, array.array) and data.typecode not in ("u", "w"):
+            return _map_buffer(data, transform, operands)
+        if isinstance(data, list):
+            return _map_list(data, transform, operands, chunk_size,
+                             fallback or _ufunc_per_element(transform, operands))
+    
+    # 汎用の経路（1要素ずつ変換する）
+    for i in range(len(data)):
+        data[i] = transform(data[i], *operands)
+    return data
+
+def map_file_inplace(path, dtype, transform, *operands, chunk_size=CHUNK_ELEMENTS):
+    """
+    固定長の数値レコードが並んだバイナリファイル（mmap_search.write_records の形式）を、
+    メモリマップしてチャンクごとに変換する（ファイル全体をメモリに読み込まない）
+    
+    Parameters:
+        path (str): ファイルのパス
+        dtype (str): レコードの型（"int64" など NumPy の型名）
+        transform: NumPy の ufunc
+        operands: ufunc に渡す追加の引数
+        chunk_size (int): 一度に変換する要素数
+    """
+    if np is None:
+        raise RuntimeError("map_file_inplace には NumPy が必要です")
+    if not _is_ufunc(transform):
+        raise TypeError("map_file_inplace の transform には NumPy の ufunc を指定してください")
+    
+    data = np.memmap(path, dtype=dtype, mode="r+")
+    try:
+        _map_ndarray(data, transform, operands, chunk_size)
+    finally:
+        del data  # マッピングを閉じる
+
+def _double(value):
+    return value * 2
+
+def double_all_elements_inplace(arr):
+    """配列内のすべての要素を、新しい配列を作らずに2倍にする（list の要素は Python の value * 2 と同じ結果）"""
+    if np is None:
+        return map_inplace(arr, _double)
+    return map_inplace(arr, np.multiply, 2, fallback=_double)
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+    
+    size = 1000000
+    for name, create in [
+        ("list", lambda: list(range(size))),
+        ("array('q')", lambda: array.array("q", range(size))),
+        ("numpy", lambda: np.arange(size, dtype=np.int64)),
+    ]:
+        arr = create()
+        start_time = time.perf_counter()
+        double_all_elements_inplace(arr)
+        elapsed = time.perf_counter() - start_time
+        print(f"{name}: {elapsed:.6f} 秒（先頭の要素 {arr[1]}、末尾の要素 {arr[-1]}）")
+    
+    # NumPy では結果が変わる list の要素は、Python の演算で変換する
+    for values, expected in [
+        ([2 ** 62, 1], [2 ** 63, 2]),
+        (["a", "b"], ["aa", "bb"]),
+        ([True, False], [2, 0]),
+        ([1.5, 2], [3.0, 4]),
+        ([2 ** 70, -3], [2 ** 71, -6]),
+    ]:
+        result = double_all_elements_inplace(list(values))
+        same = result == expected and list(map(type, result)) == list(map(type, expected))
+        print(f"{values} → {result}（Python の演算と{'一致' if same else '不一致'}）")
+    
+    # ファイル上の配列をチャンクごとに変換する
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "values.bin")
+        np.arange(size, dtype=np.int64).tofile(path)
+        start_time = time.perf_counter()
+        map_file_inplace(path, "int64", np.add, 1, chunk_size=1 << 16)
+        elapsed = time.perf_counter() - start_time
+        values = np.fromfile(path, dtype=np.int64)
+        print(f"memmap（チャンクごと）: {elapsed:.6f} 秒（先頭の要素 {values[0]}、末尾の要素 {values[-1]}）")
@@ -0,0 +1,52 @@
+# lazy_import.py
+# 読み込みに時間がかかるライブラリ（NumPy など）を、最初に使うときまで読み込まない
+
+import importlib.util
+import sys
+import types
+
+def lazy_module(name):
+    """
+    モジュールを遅延読み込みする
+    
+    返したモジュールは、属性に初めてアクセスしたとき（np.arange など）に実際に読み込まれます。
+    インストールされていない場合は None を返すため、これまでの
+    try: import numpy as np / except ImportError: np = None と同じく np is None で判定できます。
+    
+    Parameters:
+        name (str): モジュール名（例: "numpy"）
+    
+    Returns:
+        module: モジュール（すでに読み込まれている場合はそのモジュール）、またはインストールされていなければ None
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+def is_loaded(module):
+    """
+    モジュールが実際に読み込まれているか
+    
+    まだ読み込まれていなければ、そのモジュールの型の値（np.ndarray など）も存在しないため、
+    isinstance の判定の前に確認すると、判定のためだけに読み込むことを避けられます。
+    """
+    return module is not None and type(module) is types.ModuleType
+
+if __name__ == "__main__":
+    import time
+    
+    start_time = time.perf_counter()
+    np = lazy_module("numpy")
+    print(f"lazy_module: {(time.perf_counter() - start_time) * 1000:.2f} ms、読み込み済み: {is_loaded(np)}")
+    if np is not None:
+        start_time = time.perf_counter()
+        np.arange(3)
+        print(f"最初の使用: {(time.perf_counter() - start_time) * 1000:.2f} ms、読み込み済み: {is_loaded(np)}")
@@ -0,0 +1,232 @@
+# measured_plot.py
+# 計測した (n, 実行時間) の系列を、当てはめた計算量の曲線と重ねて両対数グラフに描く
+# 他の日のフォルダのモジュールを読み込むため、リポジトリのルートから python run.py 2025-04-23-2/code/measured_plot.py で実行する
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from benchmark_harness import session_results
+from complexity_fitter import fit_complexity
+from lazy_import import lazy_module
+
+from time_complexity_visualizer import CURVE_MODELS, new_figure, save_figure
+
+# NumPy は最初に使うときに読み込む（matplotlib は new_figure で読み込む）
+np = lazy_module("numpy")
+
+# 1つの系列で描画する点の数の上限（これを超えると間引く）
+MAX_PLOT_POINTS = 2000
+
+# 計算量の当てはめに使う点の数の上限（fit_complexity は Python のループで計算するため）
+FIT_POINTS = 200
+
+# 当てはめた曲線を描く点の数
+CURVE_POINTS = 200
+
+def decimate_minmax(xs, ys, max_points=MAX_PLOT_POINTS, log_x=True):
+    """
+    min/max 法で点を間引く
+    
+    x の範囲を max_points / 2 個の区間に分け、各区間で y が最小の点と最大の点だけを残します。
+    平均を取る間引きと違い、外れ値（GC などによる突発的な遅れ）もグラフに残ります。
+    log_x=True の場合は区間を log(x) で等間隔に取るため、両対数グラフで小さい n の側も粗くなりません。
+    
+    Parameters:
+        xs: 入力サイズ（log_x=True の場合は正の値）
+        ys: 計測値
+        max_points (int): 残す点の数の上限
+        log_x (bool): 区間を対数で等間隔に取るか
+    
+    Returns:
+        tuple: (xs, ys)（x の昇順に並べた NumPy 配列）
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    if len(xs) != len(ys):
+        raise ValueError("xs と ys の長さが一致しません")
+    if len(xs) <= max_points:
+        order = np.argsort(xs, kind="stable")
+        return xs[order], ys[order]
+    
+    buckets = max(1, max_points // 2)
+    positions = np.log(xs) if log_x else xs
+    low = positions.min()
+    width = positions.max() - low
+    if width > 0:
+        bucket_ids = np.minimum(((positions - low) / width * buckets).astype(np.int64), buckets - 1)
+    else:
+        bucket_ids = np.zeros(len(xs), dtype=np.int64)
+    
+    # 区間ごとに y の昇順に並べ、各区間の先頭（最小）と末尾（最大）を取り出す
+    order = np.lexsort((ys, bucket_ids))
+    sorted_ids = bucket_ids[order]
+    first = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+    last = np.r_[first[1:] - 1, len(order) - 1]
+    keep = np.unique(np.concatenate([order[first], order[last]]))
+    keep = keep[np.argsort(xs[keep], kind="stable")]
+    return xs[keep], ys[keep]
+
+def fit_sample(xs, ys, count=FIT_POINTS):
+    """
+    計算量の当てはめに使う点を、x の対数で等間隔になるように count 個まで選ぶ
+    
+    Returns:
+        tuple: (xs, ys)（Python の数値のリスト）
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    order = np.argsort(xs, kind="stable")
+    if len(order) > count:
+        positions = np.unique(np.round(np.geomspace(1, len(order), count)).astype(np.int64) - 1)
+        order = order[positions]
+    return xs[order].tolist(), ys[order].tolist()
+
+def _result_size(params):
+    """計測結果の引数の概要から入力サイズを取り出す（最初の引数の値または長さ）"""
+    value = params.get("arg0") if params else None
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, dict):
+        return value.get("len")
+    return None
+
+def series_from_results(results=None, min_points=3):
+    """
+    計測結果を関数の名前ごとの (n, 実行時間) の系列にまとめる
+    
+    入力サイズは最初の引数から取ります（整数ならその値、配列なら長さ）。
+    同じ n で複数回計測した場合は、実行時間の最小値を使います。
+    
+    Parameters:
+        results (list): BenchmarkResult、または JSON レポートの "results" の辞書のリスト
+                        （省略時はこのプロセスで計測したすべての結果）
+        min_points (int): 系列として扱う異なる n の最小の数
+    
+    Returns:
+        dict: {名前: (入力サイズのリスト, 実行時間（秒）のリスト)}
+    """
+    if results is None:
+        results = session_results()
+    grouped = {}
+    for result in results:
+        if isinstance(result, dict):
+            name, params, seconds = result["name"], result["params"], result["min_ns"] / 1e9
+        else:
+            name, params, seconds = result.name, result.params, result.min_seconds
+        n = _result_size(params)
+        if n is None or n < 1:
+            continue
+        points = grouped.setdefault(name, {})
+        points[n] = min(seconds, points.get(n, seconds))
+    
+    series = {}
+    for name, points in grouped.items():
+        if len(points) >= min_points:
+            ns = sorted(points)
+            series[name] = (ns, [points[n] for n in ns])
+    return series
+
+def plot_measured_series(series, path, title="計測値と推定した計算量", ylabel="実行時間 (秒)",
+                         max_points=MAX_PLOT_POINTS):
+    """
+    計測した系列と、それぞれに当てはめた計算量の曲線を両対数グラフに重ねて保存する
+    
+    各系列は MAX_PLOT_POINTS 点までに min/max 法で間引いてから描画し、
+    計算量の当てはめは FIT_POINTS 点までに間引いた点で行います。
+    そのため数百万点の系列でも描画は1秒未満で終わります。
+    
+    Parameters:
+        series (dict): {名前: (入力サイズ, 計測値)}
+        path (str): 保存先（拡張子で形式を決める）
+        title (str): グラフのタイトル
+        ylabel (str): 縦軸の名前
+        max_points (int): 1つの系列で描画する点の数の上限
+    
+    Returns:
+        dict: {名前: ComplexityFit}（点が3つ未満の系列は当てはめない）
+    """
+    figure = new_figure((10, 6))
+    axes = figure.add_subplot()
+    fits = {}
+    
+    for index, (name, (ns, ys)) in enumerate(series.items()):
+        color = f"C{index % 10}"
+        xs, values = decimate_minmax(ns, ys, max_points)
+        positive = (xs > 0) & (values > 0)
+        axes.plot(xs[positive], values[positive], "o", markersize=3, color=color, label=f"{name}（計測値）")
+        
+        sample_ns, sample_ys = fit_sample(ns, ys)
+        if len(sample_ns) < 3 or min(sample_ns) < 1:
+            continue
+        fit = fit_complexity(sample_ns, sample_ys)
+        fits[name] = fit
+        curve_ns = np.geomspace(sample_ns[0], sample_ns[-1], CURVE_POINTS)
+        curve_ys = np.array([fit.predict(n) for n in curve_ns])
+        model_label = CURVE_MODELS[fit.label][0]
+        axes.plot(curve_ns, curve_ys, "--", color=color, label=f"{name}（当てはめ: {model_label}）")
+    
+    axes.set_xscale("log")
+    axes.set_yscale("log")
+    axes.set_xlabel('入力サイズ (n)')
+    axes.set_ylabel(ylabel)
+    axes.set_title(title)
+    axes.legend()
+    axes.grid(True, which="both", alpha=0.3)
+    save_figure(figure, path)
+    return fits
+
+def plot_benchmark_results(output_dir, results=None, formats=("png",)):
+    """
+    計測結果の関数ごとに、計測値と当てはめた曲線のグラフを output_dir に書き出す
+    
+    Returns:
+        list: 書き出したファイルのパス
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for name, (ns, ys) in series_from_results(results).items():
+        # 関数名の <lambda> などをファイル名に使える文字に置き換える
+        stem = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+        for extension in formats:
+            path = os.path.join(output_dir, f"{stem}.{extension}")
+            fits = plot_measured_series({name: (ns, ys)}, path, title=f"{name} の実行時間")
+            paths.append(path)
+            if name in fits:
+                print(f"{name}: {fits[name].label}（{len(ns)} 点）→ '{path}'")
+    return paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="計測結果の JSON から、計測値と当てはめた計算量のグラフを描く")
+    parser.add_argument("reports", nargs="+", help="benchmark_harness の --json で書き出したファイル")
+    parser.add_argument("--output", default="plots", metavar="DIR", help="グラフを書き出すディレクトリ")
+    parser.add_argument("--format", action="append", choices=["png", "svg", "pdf"], help="出力する形式（複数指定可）")
+    args = parser.parse_args(argv)
+    
+    results = []
+    for path in args.reports:
+        with open(path, encoding="utf-8") as f:
+            results.extend(json.load(f)["results"])
+    paths = plot_benchmark_results(args.output, results, tuple(args.format or ["png"]))
+    if not paths:
+        print("3点以上の入力サイズで計測した関数がありません")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main())
+    
+    # 引数がない場合は、ノイズを加えた 100 万点の合成データで間引きと描画の時間を確かめる
+    rng = np.random.default_rng(0)
+    ns = np.arange(1, 1000001)
+    ys = 1e-8 * ns * np.log2(ns + 1) * rng.lognormal(0, 0.1, len(ns)) + 1e-7
+    # 1回目は matplotlib の読み込みを含むため、2回目の時間も表示する
+    for attempt in ("1回目", "2回目"):
+        start_time = time.perf_counter()
+        fits = plot_measured_series({"合成データ O(n log n)": (ns, ys)}, "measured_vs_fit.png")
+        print(f"{len(ns)} 点の描画（{attempt}）: {time.perf_counter() - start_time:.3f} 秒、推定 {fits}")
@@ -0,0 +1,201 @@
+# memory_measure.py
+# 計算量分析スクリプトで共通に使うメモリ使用量の計測ツール
+
+import array
+import gc
+import os
+import sys
+import tracemalloc
+from collections import deque
+
+from lazy_import import is_loaded, lazy_module
+
+# NumPy は最初に使うときに読み込む（ない環境では None になり、ndarray を特別扱いしない）
+np = lazy_module("numpy")
+
+# 中身をたどるコンテナの型
+_CONTAINER_TYPES = (list, tuple, set, frozenset, deque)
+
+# 中身を持たない（それ自体の大きさだけを数える）型
+_LEAF_TYPES = (int, float, complex, bool, str, bytes, bytearray, array.array, type(None))
+
+class MemoryResult:
+    """
+    1回の操作のメモリ計測結果
+    
+    - peak_bytes: 操作中に Python が新たに確保したメモリの最大値（tracemalloc）
+    - retained_bytes: 操作後も残っている確保量（一時的なメモリは含まない）
+    - rss_delta_bytes: 操作の前後でのプロセスの常駐メモリ（RSS）の差（取得できない環境では None）
+    - result_bytes: 戻り値が参照しているオブジェクト全体の大きさ（deep_sizeof、参照したときに求める）
+    """
+    
+    def __init__(self, name, peak_bytes, retained_bytes, rss_delta_bytes, result=None):
+        self.name = name
+        self.peak_bytes = peak_bytes
+        self.retained_bytes = retained_bytes
+        self.rss_delta_bytes = rss_delta_bytes
+        self.result = result
+        self._result_bytes = None
+    
+    @property
+    def result_bytes(self):
+        # 大きな配列では時間がかかるため、必要になったときに一度だけ求める
+        if self._result_bytes is None:
+            self._result_bytes = deep_sizeof(self.result)
+        return self._result_bytes
+    
+    def to_dict(self):
+        """JSON に書き出せる辞書に変換する（関数の戻り値は含めない）"""
+        return {
+            "name": self.name,
+            "peak_bytes": self.peak_bytes,
+            "retained_bytes": self.retained_bytes,
+            "rss_delta_bytes": self.rss_delta_bytes,
+            "result_bytes": self.result_bytes,
+        }
+    
+    def __repr__(self):
+        return (f"MemoryResult({self.name!r}, peak={format_bytes(self.peak_bytes)}, "
+                f"retained={format_bytes(self.retained_bytes)}, "
+                f"rss_delta={format_bytes(self.rss_delta_bytes)})")
+
+def format_bytes(size):
+    """バイト数を読みやすい単位の文字列にする"""
+    if size is None:
+        return "-"
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
+def deep_sizeof(obj):
+    """
+    オブジェクトが参照しているものを含めた大きさ（バイト）を求める
+    
+    sys.getsizeof はリスト自体（要素への参照の配列）の大きさしか返さないため、
+    要素の int オブジェクトなどもたどって合計します。同じオブジェクトは1回だけ数えます
+    （小さい int のようにインタプリタが共有しているオブジェクトも1回として数える）。
+    
+    Parameters:
+        obj: 対象のオブジェクト
+    
+    Returns:
+        int: 大きさ（バイト）
+    """
+    seen = {id(obj)}
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        total += sys.getsizeof(current)
+        
+        if isinstance(current, _LEAF_TYPES):
+            continue
+        if is_loaded(np) and isinstance(current, np.ndarray):
+            # 他の配列のビューは自身のデータを持たないため、元の配列をたどる
+            if current.base is not None:
+                stack.append(current.base)
+            continue
+        if isinstance(current, dict):
+            children = list(current.keys()) + list(current.values())
+        elif isinstance(current, _CONTAINER_TYPES):
+            children = current
+        else:
+            children = []
+            if hasattr(current, "__dict__"):
+                children.append(current.__dict__)
+            for slot in getattr(type(current), "__slots__", ()):
+                if hasattr(current, slot):
+                    children.append(getattr(current, slot))
+        
+        for child in children:
+            key = id(child)
+            if key in seen:
+                continue
+            seen.add(key)
+            # 要素の大半を占める数値や文字列はスタックに積まずにその場で数える
+            if type(child) in _LEAF_TYPES:
+                total += sys.getsizeof(child)
+            else:
+                stack.append(child)
+    return total
+
+def current_rss():
+    """
+    プロセスの現在の常駐メモリ（RSS、バイト）
+    
+    /proc/self/statm が読める環境（Linux）でのみ値を返し、それ以外では None を返します。
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+def measure_memory(func, args=(), kwargs=None, setup=None, name=None):
+    """
+    関数を実行し、その間のメモリの確保量を計測する
+    
+    まず tracemalloc を止めた状態で1回実行して RSS の増減を求め、
+    次に tracemalloc を有効にしてもう1回実行し、確保量の最大値と残った量を求めます
+    （tracemalloc 自身の管理用メモリが RSS に混ざらないようにするため）。
+    tracemalloc は実行を遅くするため、時間の計測（benchmark）とは別に呼んでください。
+    RSS は解放したメモリがすぐには OS に返らないため、目安として扱います。
+    
+    Parameters:
+        func (callable): 計測する関数（2回実行される。入力を書き換える関数は setup を使う）
+        args (tuple): func に渡す位置引数
+        kwargs (dict): func に渡すキーワード引数
+        setup (callable): 毎回の実行前に呼ぶ関数。戻り値のタプルを func の引数にする（計測には含めない）
+        name (str): 結果の名前（省略時は関数名）
+    
+    Returns:
+        MemoryResult: 計測結果
+    """
+    kwargs = kwargs or {}
+    name = name or getattr(func, "__name__", repr(func))
+    
+    def prepare():
+        return setup() if setup is not None else args
+    
+    # 計測前に一度だけ回収する
+    gc.collect()
+    
+    # RSS の増減（tracemalloc を止めて計測する）
+    rss_delta = None
+    if not tracemalloc.is_tracing():
+        call_args = prepare()
+        rss_before = current_rss()
+        result = func(*call_args, **kwargs)
+        rss_after = current_rss()
+        if rss_before is not None and rss_after is not None:
+            rss_delta = rss_after - rss_before
+        del call_args, result
+    
+    # Python のメモリ確保量（tracemalloc）
+    call_args = prepare()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        result = func(*call_args, **kwargs)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started:
+            tracemalloc.stop()
+    
+    return MemoryResult(name, peak - before, after - before, rss_delta, result)
+
+if __name__ == "__main__":
+    for size in [10, 1000, 100000]:
+        arr = list(range(size))
+        print(f"配列サイズ {size}: getsizeof {format_bytes(sys.getsizeof(arr))}、"
+              f"deep_sizeof {format_bytes(deep_sizeof(arr))}")
+    
+    print(measure_memory(lambda n: list(range(n)), (1000000,), name="list(range(n))"))
+    print(measure_memory(lambda n: [i * i for i in range(n)], (1000000,), name="内包表記"))
+    print(measure_memory(lambda n: sum(range(n)), (1000000,), name="sum(range(n))"))
@@ -1,15 +1,18 @@
 # mystery_function_analysis.py
 # ミステリー関数の計算量分析
+# 他の日のフォルダのモジュールを読み込むため、リポジトリのルートから python run.py 2025-04-23-2/code/mystery_function_analysis.py で実行する
 
-import time
-import matplotlib.pyplot as plt
+import argparse
 
-def measure_time(func, *args, **kwargs):
-    """関数の実行時間を計測する"""
-    start_time = time.time()
-    result = func(*args, **kwargs)
-    end_time = time.time()
-    return result, end_time - start_time
+from benchmark_harness import benchmark, measure_time, write_json_report
+from complexity_fitter import print_complexity_fit
+from lazy_import import is_loaded, lazy_module
+from measured_plot import plot_benchmark_results
+from op_counter import count_lines, count_operations, find_line
+from size_sweep import adaptive_sweep, measure_step, sweep_sizes
+
+# NumPy は最初に使うときに読み込む（ベクトル化した計算でだけ使う）
+np = lazy_module("numpy")
 
 # ==== ミステリー関数1 ====
 def mystery_function_1(n):
@@ -31,6 +34,50 @@ def mystery_function_1(n):
     
     return result, operations
 
+def mystery_function_1_closed_form(n):
+    """
+    Mystery関数1の結果を閉じた式で計算する - O(1)
+    - i <= j となるすべての組 (i, j) について i * j を足し合わせたもの
+    - 結果 = ((Σi)² + Σi²) / 2（i は 0 から n-1 まで）
+    - 操作回数は元のループと同じ n(n+1)/2 を返す
+    """
+    if n <= 0:
+        return 0, 0
+    
+    sum_i = n * (n - 1) // 2                    # Σi
+    sum_i_squared = (n - 1) * n * (2 * n - 1) // 6  # Σi²
+    result = (sum_i * sum_i + sum_i_squared) // 2
+    operations = n * (n + 1) // 2
+    
+    return result, operations
+
+# int64 で各項 i * Σj（最大 n³/2）があふれない n の上限
+VECTORIZED_MAX_N = 2000000
+
+def mystery_function_1_vectorized(n):
+    """
+    Mystery関数1の結果を NumPy で計算する - O(n)
+    - 内側のループ Σj (j = i..n-1) を等差数列の和 Σj = T - i(i-1)/2 に置き換える（T = n(n-1)/2）
+    - 外側のループを NumPy の配列演算で一度に計算する
+    - 総和は int64 をあふれるため、各項を上位32ビットと下位32ビットに分けて合計する
+    """
+    if n <= 0:
+        return 0, 0
+    if n > VECTORIZED_MAX_N:
+        raise ValueError(f"n が大きすぎます（上限 {VECTORIZED_MAX_N}）。mystery_function_1_closed_form を使ってください")
+    
+    total = n * (n - 1) // 2
+    i = np.arange(n, dtype=np.int64)
+    terms = i * (total - i * (i - 1) // 2)
+    
+    # 上位・下位それぞれの合計は n < 2³¹ なら int64 に収まる
+    high = int(np.sum(terms >> 32))
+    low = int(np.sum(terms & 0xFFFFFFFF))
+    result = (high << 32) + low
+    
+    operations = n * (n + 1) // 2
+    return result, operations
+
 def test_mystery_function_1():
     print("\n===== ミステリー関数1の計算量分析 =====")
     print("コード:")
@@ -46,14 +93,16 @@ def test_mystery_function_1():
     print("理由: 外側のループがn回、内側のループがiの値に依存して(n-i)回実行される")
     print("操作回数の総和: n(n+1)/2 ≈ O(n²)")
     
-    sizes = [10, 100, 1000, 3000]
+    # 実行時間と操作回数の計測（入力サイズは時間の予算に収まる範囲で自動的に増やす）
+    points = adaptive_sweep(lambda n: measure_step(mystery_function_1, n), start_n=10)
+    sizes = sweep_sizes(points)
     times = []
     operations_counts = []
     theoretical_counts = []
     
-    for size in sizes:
-        # 実行時間と操作回数の計測
-        result, execution_time = measure_time(mystery_function_1, size)
+    for point in points:
+        size = point.n
+        result, execution_time = point.result
         _, operations = result
         
         # 理論的な操作回数（n(n+1)/2）
@@ -67,6 +116,38 @@ def test_mystery_function_1():
         print(f"  操作回数: {operations}")
         print(f"  理論値: {theoretical_count}")
         print(f"  実行時間: {execution_time:.8f} 秒")
+    
+    print_complexity_fit(sizes, times, "推定計算量（実行時間）", expected="O(n²)")
+    print_complexity_fit(sizes, operations_counts, "推定計算量（操作回数）", expected="O(n²)")
+
+def test_mystery_function_1_fast():
+    print("\n===== ミステリー関数1の高速化（閉じた式・ベクトル化） =====")
+    print("閉じた式: ((Σi)² + Σi²) / 2 → O(1)")
+    print("ベクトル化: 内側のループを等差数列の和に置き換え、外側を NumPy で計算 → O(n)")
+    
+    # 元のループとの照合
+    for size in [0, 1, 2, 10, 100, 1000]:
+        reference = mystery_function_1(size)
+        assert mystery_function_1_closed_form(size) == reference
+        assert mystery_function_1_vectorized(size) == reference
+    print("サイズ 0〜1000 で元のループと結果・操作回数が一致しました")
+    
+    sizes = [10 ** 3, 10 ** 6, 10 ** 9]
+    
+    for size in sizes:
+        result, execution_time = measure_time(mystery_function_1_closed_form, size)
+        value, operations = result
+        theoretical_count = size * (size + 1) // 2
+        
+        print(f"サイズ {size}:")
+        print(f"  結果: {value}")
+        print(f"  操作回数: {operations}（理論値 {theoretical_count}）")
+        print(f"  閉じた式の実行時間: {execution_time:.8f} 秒")
+        
+        if size <= VECTORIZED_MAX_N:
+            vectorized, vectorized_time = measure_time(mystery_function_1_vectorized, size)
+            assert vectorized == result
+            print(f"  ベクトル化の実行時間: {vectorized_time:.8f} 秒")
 
 # ==== ミステリー関数2 ====
 def mystery_function_2(arr):
@@ -91,6 +172,49 @@ def mystery_function_2(arr):
     
     return result, operations
 
+def _exact_sum(values):
+    """
+    NumPy 配列の合計を Python の数値で返す
+    
+    整数の配列は int64 の合計があふれないように、mystery_function_1_vectorized と同じく
+    各要素を上位32ビットと下位32ビットに分けて合計します（要素数が 2³¹ 未満なら正確）。
+    """
+    if values.dtype.kind in "iu":
+        values = values.astype(np.int64 if values.dtype.kind == "i" else np.uint64, copy=False)
+        high = int(np.sum(values >> 32))
+        low = int(np.sum(values & 0xFFFFFFFF))
+        return (high << 32) + low
+    total = values.sum()
+    return total.item() if isinstance(total, np.generic) else total
+
+def mystery_function_2_fast(data):
+    """
+    Mystery関数2の結果を1回の走査で計算する - O(n)
+    - 元の二重ループの結果は Σ(偶数の要素) × Σ(すべての要素) に等しい
+    - NumPy 配列の場合はベクトル化して計算する（合計は桁あふれしないように _exact_sum で求める）
+    - それ以外のイテラブル（ジェネレータやファイルから読み込む値など）は、
+      要素を保持せずに1回だけ走査する
+    - 操作回数は元の関数と同じ定義（n + 偶数の個数 × n）で返す
+    """
+    if is_loaded(np) and isinstance(data, np.ndarray):
+        evens = data[data % 2 == 0]
+        n = len(data)
+        result = _exact_sum(evens) * _exact_sum(data)
+        return result, n + len(evens) * n
+    
+    n = 0
+    even_count = 0
+    even_sum = 0
+    total_sum = 0
+    for value in data:
+        n += 1
+        total_sum += value
+        if value % 2 == 0:
+            even_count += 1
+            even_sum += value
+    
+    return even_sum * total_sum, n + even_count * n
+
 def test_mystery_function_2():
     print("\n===== ミステリー関数2の計算量分析 =====")
     print("コード:")
@@ -136,6 +260,42 @@ def test_mystery_function_2():
     print(f"  操作回数: {operations_worst}")
     print(f"  実行時間: {time_worst:.8f} 秒")
 
+def test_mystery_function_2_fast():
+    print("\n===== ミステリー関数2の高速化（1回の走査） =====")
+    print("結果 = Σ(偶数の要素) × Σ(すべての要素) → O(n)")
+    
+    # 元の関数との照合
+    size = 1000
+    for label, arr in [
+        ("すべて奇数", [i * 2 + 1 for i in range(size)]),
+        ("半分が偶数", [i for i in range(size)]),
+        ("すべて偶数", [i * 2 for i in range(size)]),
+    ]:
+        reference, reference_time = measure_time(mystery_function_2, arr)
+        fast, fast_time = measure_time(mystery_function_2_fast, arr)
+        assert fast == reference
+        print(f"{label}: 操作回数 {fast[1]}、元の関数 {reference_time:.8f} 秒 / 高速版 {fast_time:.8f} 秒")
+    
+    # メモリに載せないストリーム入力と NumPy 配列
+    size = 10000000
+    # ジェネレータは1回しか読めないため、計測のたびに作り直す
+    stream = benchmark(mystery_function_2_fast, setup=lambda: ((i for i in range(size)),))
+    result, stream_time = stream.result, stream.min_seconds
+    print(f"ストリーム入力（{size} 要素）: {stream_time:.8f} 秒")
+    
+    numbers = np.arange(size, dtype=np.int64)
+    vectorized, vectorized_time = measure_time(mystery_function_2_fast, numbers)
+    assert vectorized == result
+    print(f"NumPy 配列（{size} 要素）: {vectorized_time:.8f} 秒")
+    
+    # 合計が int64 の範囲を超える大きな値や負の値でも、元の関数と同じ結果になる
+    for large in [
+        np.full(10, 2 ** 61),
+        np.array([2 ** 62, -(2 ** 63), 2 ** 63 - 1, 6]),
+        np.full(10, 2 ** 63, dtype=np.uint64),
+    ]:
+        assert mystery_function_2_fast(large) == mystery_function_2(large.tolist())
+
 # ==== ミステリー関数3（ソート済み行列の探索） ====
 def search_sorted_matrix(matrix, target):
     """
@@ -223,13 +383,50 @@ def test_search_sorted_matrix():
         print(f"  操作回数: {operations_not_exists}")
         print(f"  実行時間: {time_not_exists:.8f} 秒")
 
+# ==== 関数のコードを変えずに操作回数を数える ====
+def test_operation_counting():
+    print("\n===== 計測用の代理オブジェクトと行のトレースによる操作回数 =====")
+    print("関数の中のカウンター（operations += 1）と、外から数えた回数を比べる")
+    
+    # mystery_function_1: 引数が整数だけなので、内側のループの本体の行の実行回数を数える
+    inner_line = find_line(mystery_function_1, "result += i * j")
+    print("\nmystery_function_1（内側のループの本体の実行回数）:")
+    for n in [10, 50, 100]:
+        (_, operations), hits = count_lines(mystery_function_1, n)
+        print(f"  n = {n}: カウンター {operations} 回、行のトレース {hits.get(inner_line, 0)} 回")
+    
+    # mystery_function_2: 配列を代理オブジェクトで包み、比較・読み出し・演算を数える
+    print("\nmystery_function_2（偶数と奇数が交互の配列）:")
+    for n in [10, 50, 100]:
+        (_, operations), counts = count_operations(mystery_function_2, list(range(n)))
+        print(f"  n = {n}: カウンター {operations} 回、{counts}")
+    
+    # search_sorted_matrix: 行列の各行も代理オブジェクトで包まれる
+    print("\nsearch_sorted_matrix（存在しない値の探索）:")
+    for size in [10, 50, 100]:
+        (_, operations), counts = count_operations(search_sorted_matrix, create_sorted_matrix(size), size * size + 100)
+        print(f"  {size}x{size}: カウンター {operations} 回、{counts}")
+
 # メイン実行部分
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ミステリー関数の計算量分析")
+    parser.add_argument("--json", help="計測結果を書き出す JSON ファイルのパス")
+    parser.add_argument("--plot", metavar="DIR", help="計測値と当てはめた計算量のグラフを書き出すディレクトリ")
+    args = parser.parse_args()
+    
     print("ミステリー関数の計算量分析を開始します...")
     
     # 各関数のテスト
     test_mystery_function_1()
+    test_mystery_function_1_fast()
     test_mystery_function_2()
+    test_mystery_function_2_fast()
     test_search_sorted_matrix()
+    test_operation_counting()
+    
+    if args.json:
+        write_json_report(args.json)
+    if args.plot:
+        plot_benchmark_results(args.plot)
     
     print("\n分析が完了しました。")
@@ -0,0 +1,255 @@
+# op_counter.py
+# アルゴリズムのコードを変えずに、比較・読み出し・書き込みの回数や各行の実行回数を数える
+
+import array
+import inspect
+import operator
+import sys
+
+class OperationCounts:
+    """
+    数えた操作の回数
+    
+    - comparisons: 要素の比較（==, !=, <, <=, >, >=）
+    - reads: 配列からの要素の読み出し
+    - writes: 配列への要素の書き込み（代入・追加・挿入）
+    - arithmetic: 要素を使った算術演算
+    """
+    
+    def __init__(self):
+        self.comparisons = 0
+        self.reads = 0
+        self.writes = 0
+        self.arithmetic = 0
+    
+    def total(self):
+        return self.comparisons + self.reads + self.writes + self.arithmetic
+    
+    def to_dict(self):
+        return {
+            "comparisons": self.comparisons,
+            "reads": self.reads,
+            "writes": self.writes,
+            "arithmetic": self.arithmetic,
+        }
+    
+    def __repr__(self):
+        return (f"OperationCounts(comparisons={self.comparisons}, reads={self.reads}, "
+                f"writes={self.writes}, arithmetic={self.arithmetic})")
+
+class CountingValue:
+    """
+    比較や算術演算の回数を数える要素の代理オブジェクト
+    
+    算術演算の結果も CountingValue になるため、arr[i] % 2 == 0 のような式の比較も数えられます。
+    """
+    
+    __slots__ = ("value", "_counts")
+    
+    def __init__(self, value, counts):
+        self.value = value
+        self._counts = counts
+    
+    def __hash__(self):
+        return hash(self.value)
+    
+    def __bool__(self):
+        return bool(self.value)
+    
+    def __int__(self):
+        return int(self.value)
+    
+    def __float__(self):
+        return float(self.value)
+    
+    def __index__(self):
+        return operator.index(self.value)
+    
+    def __repr__(self):
+        return repr(self.value)
+
+def _comparison(function):
+    def compare(self, other):
+        self._counts.comparisons += 1
+        return function(self.value, unwrap(other))
+    return compare
+
+def _arithmetic(function, reflected=False):
+    def calculate(self, other):
+        self._counts.arithmetic += 1
+        if reflected:
+            return CountingValue(function(unwrap(other), self.value), self._counts)
+        return CountingValue(function(self.value, unwrap(other)), self._counts)
+    return calculate
+
+def _unary(function):
+    def calculate(self):
+        self._counts.arithmetic += 1
+        return CountingValue(function(self.value), self._counts)
+    return calculate
+
+for _name, _function in [("eq", operator.eq), ("ne", operator.ne), ("lt", operator.lt),
+                         ("le", operator.le), ("gt", operator.gt), ("ge", operator.ge)]:
+    setattr(CountingValue, f"__{_name}__", _comparison(_function))
+
+for _name, _function in [("add", operator.add), ("sub", operator.sub), ("mul", operator.mul),
+                         ("truediv", operator.truediv), ("floordiv", operator.floordiv),
+                         ("mod", operator.mod), ("pow", operator.pow)]:
+    setattr(CountingValue, f"__{_name}__", _arithmetic(_function))
+    setattr(CountingValue, f"__r{_name}__", _arithmetic(_function, reflected=True))
+
+for _name, _function in [("neg", operator.neg), ("pos", operator.pos), ("abs", operator.abs)]:
+    setattr(CountingValue, f"__{_name}__", _unary(_function))
+
+class CountingSequence:
+    """
+    要素の読み出し・書き込みの回数を数える配列の代理オブジェクト
+    
+    読み出した要素は CountingValue（要素が配列の場合は CountingSequence）で返すため、
+    その後の比較の回数も数えられます。len() は数えません。
+    """
+    
+    __slots__ = ("_data", "_counts")
+    
+    def __init__(self, data, counts):
+        self._data = data
+        self._counts = counts
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            part = self._data[index]
+            self._counts.reads += len(part)
+            return CountingSequence(part, self._counts)
+        self._counts.reads += 1
+        return instrument(self._data[unwrap(index)], self._counts)
+    
+    def __setitem__(self, index, value):
+        self._counts.writes += 1
+        self._data[unwrap(index)] = unwrap(value)
+    
+    def __iter__(self):
+        for value in self._data:
+            self._counts.reads += 1
+            yield instrument(value, self._counts)
+    
+    def append(self, value):
+        self._counts.writes += 1
+        self._data.append(unwrap(value))
+    
+    def insert(self, index, value):
+        self._counts.writes += 1
+        self._data.insert(unwrap(index), unwrap(value))
+    
+    def __repr__(self):
+        return f"CountingSequence({self._data!r})"
+
+# 代理オブジェクトで包む配列の型
+_SEQUENCE_TYPES = (list, tuple, array.array)
+
+def instrument(value, counts):
+    """値を代理オブジェクトで包む（配列は CountingSequence、それ以外は CountingValue）"""
+    if isinstance(value, (CountingSequence, CountingValue)):
+        return value
+    if isinstance(value, _SEQUENCE_TYPES):
+        return CountingSequence(value, counts)
+    return CountingValue(value, counts)
+
+def unwrap(value):
+    """代理オブジェクトから元の値を取り出す（タプルの中身も取り出す）"""
+    if isinstance(value, CountingValue):
+        return value.value
+    if isinstance(value, CountingSequence):
+        return value._data
+    if isinstance(value, tuple):
+        return tuple(unwrap(item) for item in value)
+    return value
+
+def count_operations(func, *args, **kwargs):
+    """
+    配列の引数を代理オブジェクトで包んで func を実行し、操作の回数を数える
+    
+    func のコードは変更しません。代理オブジェクトは count_operations の中でだけ使うため、
+    通常の呼び出しには何の負荷もかかりません（計測しないときは元の関数をそのまま呼ぶ）。
+    配列以外の引数（探索する値など）はそのまま渡します。
+    
+    Returns:
+        tuple: (func の戻り値（代理オブジェクトは元の値に戻す）, OperationCounts)
+    """
+    counts = OperationCounts()
+    wrapped_args = [instrument(arg, counts) if isinstance(arg, _SEQUENCE_TYPES) else arg for arg in args]
+    wrapped_kwargs = {
+        key: instrument(value, counts) if isinstance(value, _SEQUENCE_TYPES) else value
+        for key, value in kwargs.items()
+    }
+    result = func(*wrapped_args, **wrapped_kwargs)
+    return unwrap(result), counts
+
+def count_lines(func, *args, **kwargs):
+    """
+    sys.settrace で func の各行の実行回数を数える（func から呼ばれた関数の行は数えない）
+    
+    引数が整数だけの関数（mystery_function_1 など）でも、内側のループの行の実行回数から
+    操作の回数が分かります。トレース中は実行がかなり遅くなります。
+    
+    Returns:
+        tuple: (func の戻り値, {行番号: 実行回数})
+    """
+    code = func.__code__
+    hits = {}
+    
+    def trace_lines(frame, event, arg):
+        if event == "line":
+            hits[frame.f_lineno] = hits.get(frame.f_lineno, 0) + 1
+        return trace_lines
+    
+    def trace_calls(frame, event, arg):
+        if frame.f_code is code:
+            return trace_lines
+        return None
+    
+    previous = sys.gettrace()
+    sys.settrace(trace_calls)
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        sys.settrace(previous)
+    return result, hits
+
+def find_line(func, text):
+    """func のソースコードで text を含む最初の行の行番号（count_lines の結果を引くのに使う）"""
+    lines, start = inspect.getsourcelines(func)
+    for offset, line in enumerate(lines):
+        if text in line:
+            return start + offset
+    raise ValueError(f"{func.__name__} に '{text}' を含む行がありません")
+
+def print_line_counts(func, hits):
+    """count_lines の結果をソースコードの各行と並べて表示する"""
+    lines, start = inspect.getsourcelines(func)
+    for offset, line in enumerate(lines):
+        count = hits.get(start + offset)
+        label = f"{count:>10}" if count is not None else " " * 10
+        print(f"{label}  {line.rstrip()}")
+
+if __name__ == "__main__":
+    def find(arr, target):
+        for i in range(len(arr)):
+            if arr[i] == target:
+                return i
+        return -1
+    
+    def bubble_sort(arr):
+        n = len(arr)
+        for i in range(n):
+            for j in range(n - 1 - i):
+                if arr[j] > arr[j + 1]:
+                    arr[j], arr[j + 1] = arr[j + 1], arr[j]
+        return arr
+    
+    print(count_operations(find, list(range(100)), 42))
+    print(count_operations(bubble_sort, [5, 2, 9, 1, 7, 3]))
+    result, hits = count_lines(bubble_sort, [5, 2, 9, 1, 7, 3])
+    print_line_counts(bubble_sort, hits)
@@ -0,0 +1,136 @@
+# pair_kernels.py
+# すべての要素の組 (i, j) についての集計を、二重ループを使わずに求める
+
+from lazy_import import lazy_module
+
+# NumPy は最初に使うときに読み込む（ない環境では None になり、Python のループで計算する）
+np = lazy_module("numpy")
+
+# タイルの一辺の要素数（int64 の 256x256 タイルは 512KB で、L2 キャッシュに収まる大きさ）
+TILE_SIZE = 256
+
+def pair_count(n, include_diagonal=True, ordered=True):
+    """
+    n 個の要素から作る組の数（閉じた式、O(1)）
+    
+    - ordered=True, include_diagonal=True: (i, j) のすべての組 = n²
+      （array_operations_complexity.nested_loops_processing の結果）
+    - ordered=True, include_diagonal=False: i != j の組 = n(n - 1)
+    - ordered=False, include_diagonal=True: i <= j の組 = n(n + 1) / 2
+    - ordered=False, include_diagonal=False: i < j の組 = n(n - 1) / 2
+    """
+    if n < 0:
+        raise ValueError("n は0以上である必要があります")
+    if ordered:
+        return n * n if include_diagonal else n * (n - 1)
+    return n * (n + 1) // 2 if include_diagonal else n * (n - 1) // 2
+
+def pair_product_sum(arr, ordered=True):
+    """
+    すべての組の積の合計（閉じた式、O(n)）
+    
+    - ordered=True: Σ_i Σ_j a_i·a_j = (Σa)²
+    - ordered=False: Σ_{i<=j} a_i·a_j = ((Σa)² + Σa²) / 2
+    
+    Python の整数で計算するため、値が大きくても桁あふれしません。
+    """
+    total = 0
+    square_total = 0
+    for value in arr:
+        total += value
+        square_total += value * value
+    if ordered:
+        return total * total
+    doubled = total * total + square_total
+    # 整数の場合は必ず偶数になるため、整数のまま割る
+    return doubled // 2 if isinstance(doubled, int) else doubled / 2
+
+def outer_products(arr):
+    """
+    すべての組 (i, j) の積 a_i·a_j を i, j の順に並べたもの
+    （big_o_examples.quadratic_time_example と同じ並び）
+    
+    NumPy がある場合は外積を1回の演算で求めて1次元の NumPy 配列で返します。
+    結果そのものが n² 個の要素を持つため、大きな n では iter_product_tiles を使ってください。
+    """
+    if np is None:
+        return [x * y for x in arr for y in arr]
+    values = np.asarray(arr)
+    return np.multiply.outer(values, values).ravel()
+
+def iter_product_tiles(arr, tile_size=TILE_SIZE):
+    """
+    積の行列 a_i·a_j を tile_size x tile_size のタイルに分けて順に返す
+    
+    同じ領域のバッファを使い回すため、同時に必要なメモリはタイル1つ分（O(tile_size²)）です。
+    返したタイルは次のタイルで上書きされるので、残す場合はコピーしてください。
+    
+    Yields:
+        tuple: (行の開始位置, 列の開始位置, タイル（NumPy の2次元配列）)
+    """
+    if np is None:
+        raise RuntimeError("iter_product_tiles には NumPy が必要です")
+    if tile_size < 1:
+        raise ValueError("tile_size は1以上である必要があります")
+    
+    values = np.asarray(arr)
+    n = len(values)
+    buffer = np.empty((tile_size, tile_size), dtype=np.result_type(values, values))
+    for row in range(0, n, tile_size):
+        rows = values[row:row + tile_size]
+        for col in range(0, n, tile_size):
+            cols = values[col:col + tile_size]
+            tile = buffer[:len(rows), :len(cols)]
+            np.multiply.outer(rows, cols, out=tile)
+            yield row, col, tile
+
+def reduce_product_tiles(arr, reduce, initial, tile_size=TILE_SIZE):
+    """
+    積の行列をタイルごとに集計する（メモリは O(tile_size²)、時間は O(n²)）
+    
+    閉じた式がない集計（例: 積がしきい値を超える組の数、積の最大値）に使います。
+    
+    Parameters:
+        arr: 数値の配列
+        reduce (callable): reduce(これまでの集計値, タイル) を受け取り、新しい集計値を返す関数
+        initial: 集計値の初期値
+        tile_size (int): タイルの一辺の要素数
+    
+    Returns:
+        集計値
+    """
+    accumulator = initial
+    for _, _, tile in iter_product_tiles(arr, tile_size):
+        accumulator = reduce(accumulator, tile)
+    return accumulator
+
+def count_pairs_above(arr, threshold, tile_size=TILE_SIZE):
+    """積が threshold を超える組 (i, j) の数（タイルごとに数える）"""
+    return reduce_product_tiles(
+        arr, lambda count, tile: count + int(np.count_nonzero(tile > threshold)), 0, tile_size
+    )
+
+if __name__ == "__main__":
+    import time
+    
+    arr = list(range(1, 3001))
+    n = len(arr)
+    print(f"組の数: {pair_count(n)}、i < j の組の数: {pair_count(n, False, False)}")
+    
+    start_time = time.perf_counter()
+    expected = sum(x * y for x in arr for y in arr)
+    loop_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    closed = pair_product_sum(arr)
+    closed_time = time.perf_counter() - start_time
+    print(f"積の合計: 二重ループ {loop_time:.4f} 秒、閉じた式 {closed_time:.6f} 秒（一致: {expected == closed}）")
+    
+    if np is not None:
+        threshold = n * n // 4
+        start_time = time.perf_counter()
+        full = int(np.count_nonzero(outer_products(arr) > threshold))
+        full_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        tiled = count_pairs_above(arr, threshold)
+        tiled_time = time.perf_counter() - start_time
+        print(f"積が {threshold} を超える組: 外積全体 {full_time:.4f} 秒、タイル {tiled_time:.4f} 秒（一致: {full == tiled}）")
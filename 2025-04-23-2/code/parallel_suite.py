@@ -0,0 +1,183 @@
+# parallel_suite.py
+# test_* シナリオを複数のプロセスに分けて並列に計測し、1つのレポートにまとめる
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+
+from benchmark_harness import environment_info
+from benchmark_suite import (
+    DEFAULT_BASELINE, DEFAULT_THRESHOLD, compare_with_baseline, discover_scenarios,
+    load_baseline, print_comparison, print_failures, run_scenario,
+)
+
+# 95パーセンタイル / 最小値 の比がこれを超えた計測はばらつきが大きい（ノイズあり）とみなす
+NOISE_SPREAD = 1.5
+
+# ワーカーごとの状態（_init_worker で設定する）
+_worker_core = None
+_worker_oversubscribed = False
+
+def available_cores():
+    """このプロセスが使えるCPUコアの番号のリスト"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def _init_worker(counter, cores, oversubscribed):
+    """
+    ワーカープロセスの初期化
+    
+    起動した順に番号を振り、cores の中の1つのコアに固定する。
+    ワーカー数がコア数より多い場合は同じコアを共有するため、結果にノイズの印を付ける。
+    """
+    global _worker_core, _worker_oversubscribed
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    
+    _worker_core = cores[index % len(cores)]
+    _worker_oversubscribed = oversubscribed
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, {_worker_core})
+        except OSError:
+            _worker_core = None  # 固定できない環境ではOSのスケジューラに任せる
+
+def _run_task(task):
+    """
+    ワーカーで1つのシナリオを実行する
+    
+    Returns:
+        tuple: (ScenarioRun, 使ったコア, {計測の名前: ノイズの理由のリスト})
+    """
+    module_name, function_name, repeat = task
+    module = importlib.import_module(module_name)
+    function = getattr(module, function_name)
+    run = run_scenario(f"{module_name}.{function_name}", function, repeat)
+    
+    noise = {}
+    for key, measurement in run.measurements.items():
+        reasons = []
+        if _worker_oversubscribed:
+            reasons.append("コアの共有")
+        if measurement["min_ns"] > 0 and measurement["p95_ns"] / measurement["min_ns"] > NOISE_SPREAD:
+            reasons.append("ばらつき")
+        if reasons:
+            noise[key] = reasons
+    return run, _worker_core, noise
+
+def _longest_first(scenarios, baseline):
+    """
+    基準値のシナリオ全体の時間が長いものから順に並べる
+    
+    長いシナリオを先に投入すると、最後に1つのワーカーだけが動き続ける時間が短くなる。
+    基準値のないシナリオは長いものとして先頭に置く。
+    """
+    recorded = baseline.get("scenarios", {}) if baseline else {}
+    
+    def expected_seconds(scenario):
+        reference = recorded.get(scenario[0])
+        return reference["seconds"] if reference and "seconds" in reference else float("inf")
+    
+    return sorted(scenarios, key=expected_seconds, reverse=True)
+
+def run_parallel(scenarios, workers=None, repeat=3, baseline=None):
+    """
+    シナリオをプロセスプールで並列に実行する
+    
+    各ワーカーは1つのコアに固定され、シナリオを1つずつ受け取って実行します。
+    workers が使えるコア数を超える場合、すべての計測にノイズの印が付きます。
+    
+    Parameters:
+        scenarios (list): discover_scenarios が返す (シナリオ名, 関数) のリスト
+        workers (int): ワーカー数（省略時は使えるコア数とシナリオ数の小さい方）
+        repeat (int): 各シナリオの実行回数
+        baseline (dict): 投入順を決めるための基準値（省略可）
+    
+    Returns:
+        list: (ScenarioRun, 使ったコア, {計測の名前: ノイズの理由のリスト}) のリスト（scenarios と同じ順序）
+    """
+    cores = available_cores()
+    workers = workers or min(len(cores), len(scenarios))
+    oversubscribed = workers > len(cores)
+    
+    tasks = [
+        (function.__module__, function.__name__, repeat)
+        for _, function in _longest_first(scenarios, baseline)
+    ]
+    counter = multiprocessing.Value("i", 0)
+    with multiprocessing.Pool(workers, initializer=_init_worker,
+                              initargs=(counter, cores, oversubscribed)) as pool:
+        finished = {}
+        for run, core, noise in pool.imap_unordered(_run_task, tasks):
+            print(f"完了: {run.name}（コア {core}）", file=sys.stderr)
+            finished[run.name] = (run, core, noise)
+    
+    return [finished[name] for name, _ in scenarios]
+
+def build_parallel_report(entries, workers):
+    """並列実行の結果を1つのレポート（辞書）にまとめる"""
+    scenarios = []
+    for run, core, noise in entries:
+        scenarios.append({
+            "name": run.name,
+            "seconds": run.seconds,
+            "core": core,
+            "failure": run.failure,
+            "measurements": {
+                key: dict(measurement, noisy=key in noise, noise_reasons=noise.get(key, []))
+                for key, measurement in run.measurements.items()
+            },
+        })
+    return {"environment": environment_info(), "workers": workers, "scenarios": scenarios}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="計算量分析シナリオの並列計測")
+    parser.add_argument("-j", "--workers", type=int, help="ワーカー数（省略時は使えるコア数）")
+    parser.add_argument("--repeat", type=int, default=3, help="各シナリオの実行回数")
+    parser.add_argument("-k", "--keyword", help="シナリオ名に含まれる文字列で絞り込む")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="比較する基準値ファイルのパス")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="失敗とする遅延の割合（0.2 なら 20%%）")
+    parser.add_argument("--json", metavar="PATH", help="まとめた計測結果を JSON で書き出す")
+    args = parser.parse_args(argv)
+    
+    scenarios = discover_scenarios(keyword=args.keyword)
+    if not scenarios:
+        print("対象のシナリオがありません")
+        return 1
+    
+    baseline = load_baseline(args.baseline)
+    workers = args.workers or min(len(available_cores()), len(scenarios))
+    entries = run_parallel(scenarios, workers, args.repeat, baseline)
+    
+    rows = compare_with_baseline([run for run, _, _ in entries], baseline, args.threshold)
+    print_comparison(rows)
+    
+    noisy = {key: reasons for _, _, noise in entries for key, reasons in noise.items()}
+    if noisy:
+        print(f"\nノイズの可能性がある結果（{len(noisy)} 件）:")
+        for name, reasons in noisy.items():
+            print(f"  {name}: {'、'.join(reasons)}")
+    
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(build_parallel_report(entries, workers), f, ensure_ascii=False, indent=2)
+        print(f"計測結果を '{args.json}' に書き出しました")
+    
+    if print_failures([run for run, _, _ in entries]):
+        return 1
+    
+    # ノイズのある結果は判定に使わない（単独実行で確認する）
+    regressions = [row for row in rows if row[4] == "遅延" and row[0] not in noisy]
+    if baseline is not None and regressions:
+        print(f"\n{len(regressions)} 件の計測が基準値より {args.threshold:.0%} 以上遅くなりました")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
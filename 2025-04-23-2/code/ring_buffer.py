@@ -0,0 +1,147 @@
+# ring_buffer.py
+# 先頭・末尾への追加と添字でのアクセスがすべて O(1) のシーケンス（リングバッファ）
+
+import array
+
+# 最初に確保する容量
+MIN_CAPACITY = 8
+
+class RingBuffer:
+    """
+    先頭への追加が O(1)（償却）のシーケンス
+    
+    容量が2のべき乗の配列を環状に使い、先頭の位置 _head と要素数 _size を持ちます。
+    i 番目の要素は配列の (_head + i) & (容量 - 1) の位置にあるため、
+    list.insert(0, x) のように既存の要素をずらす必要がありません。
+    容量が足りなくなったら2倍に広げます（要素を並べ直すため O(n) だが、償却すると O(1)）。
+    
+    - appendleft / append / popleft / pop: O(1)（償却）
+    - 添字でのアクセス・代入: O(1)
+    - collections.deque と違い、中央付近の要素へのアクセスも O(1)
+    
+    Parameters:
+        iterable: 最初に入れる要素（省略可）
+        typecode (str): 指定すると array.array(typecode) に要素を詰めて持つ（例: 'q'）
+    """
+    
+    def __init__(self, iterable=(), typecode=None):
+        self._typecode = typecode
+        values = list(iterable)
+        capacity = MIN_CAPACITY
+        while capacity < len(values):
+            capacity *= 2
+        self._buffer = self._allocate(capacity)
+        self._buffer[:len(values)] = self._allocate_from(values)
+        self._head = 0
+        self._size = len(values)
+    
+    def _allocate(self, capacity):
+        if self._typecode is None:
+            return [None] * capacity
+        return array.array(self._typecode, bytes(array.array(self._typecode).itemsize * capacity))
+    
+    def _allocate_from(self, values):
+        return values if self._typecode is None else array.array(self._typecode, values)
+    
+    def _grow(self):
+        """容量を2倍にし、要素を先頭から順に並べ直す"""
+        ordered = self._ordered()
+        buffer = self._allocate(len(self._buffer) * 2)
+        buffer[:len(ordered)] = ordered
+        self._buffer = buffer
+        self._head = 0
+    
+    def _ordered(self):
+        """要素を先頭から順に並べたスライス（list または array.array）"""
+        end = self._head + self._size
+        capacity = len(self._buffer)
+        if end <= capacity:
+            return self._buffer[self._head:end]
+        return self._buffer[self._head:] + self._buffer[:end - capacity]
+    
+    def _position(self, index):
+        """添字を内部の配列の位置に変換する（負の添字にも対応）"""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("RingBuffer index out of range")
+        return (self._head + index) & (len(self._buffer) - 1)
+    
+    def appendleft(self, value):
+        """先頭に要素を追加する"""
+        if self._size == len(self._buffer):
+            self._grow()
+        self._head = (self._head - 1) & (len(self._buffer) - 1)
+        self._buffer[self._head] = value
+        self._size += 1
+    
+    def append(self, value):
+        """末尾に要素を追加する"""
+        if self._size == len(self._buffer):
+            self._grow()
+        self._buffer[(self._head + self._size) & (len(self._buffer) - 1)] = value
+        self._size += 1
+    
+    def popleft(self):
+        """先頭の要素を取り出す"""
+        if self._size == 0:
+            raise IndexError("pop from an empty RingBuffer")
+        value = self._buffer[self._head]
+        if self._typecode is None:
+            self._buffer[self._head] = None  # 参照を残さない
+        self._head = (self._head + 1) & (len(self._buffer) - 1)
+        self._size -= 1
+        return value
+    
+    def pop(self):
+        """末尾の要素を取り出す"""
+        if self._size == 0:
+            raise IndexError("pop from an empty RingBuffer")
+        position = (self._head + self._size - 1) & (len(self._buffer) - 1)
+        value = self._buffer[position]
+        if self._typecode is None:
+            self._buffer[position] = None
+        self._size -= 1
+        return value
+    
+    def __len__(self):
+        return self._size
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        return self._buffer[self._position(index)]
+    
+    def __setitem__(self, index, value):
+        self._buffer[self._position(index)] = value
+    
+    def __iter__(self):
+        return iter(self._ordered())
+    
+    def to_list(self):
+        """要素を先頭から順に並べたリストを返す"""
+        return list(self._ordered())
+    
+    def __repr__(self):
+        return f"RingBuffer({self.to_list()!r})"
+
+if __name__ == "__main__":
+    import time
+    
+    buffer = RingBuffer([3, 4, 5])
+    buffer.appendleft(2)
+    buffer.appendleft(1)
+    buffer.append(6)
+    print(buffer, buffer[0], buffer[-1], buffer[2:4])
+    
+    count = 100000
+    for name, container, prepend in [
+        ("list.insert(0, x)", [], lambda arr, x: arr.insert(0, x)),
+        ("RingBuffer.appendleft(x)", RingBuffer(), RingBuffer.appendleft),
+        ("RingBuffer('q').appendleft(x)", RingBuffer(typecode="q"), RingBuffer.appendleft),
+    ]:
+        start_time = time.perf_counter()
+        for i in range(count):
+            prepend(container, i)
+        elapsed = time.perf_counter() - start_time
+        print(f"{name} を {count} 回: {elapsed:.4f} 秒（中央の要素 {container[count // 2]}）")
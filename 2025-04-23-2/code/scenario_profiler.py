@@ -0,0 +1,229 @@
+# scenario_profiler.py
+# test_* シナリオのどこで時間がかかっているかを調べる（cProfile・サンプリング・行ごとの実行回数）
+
+import argparse
+import contextlib
+import cProfile
+import io
+import linecache
+import os
+import pstats
+import sys
+import threading
+import time
+
+from benchmark_suite import discover_scenarios
+
+# サンプリングの間隔（秒）
+SAMPLE_INTERVAL = 0.001
+
+# 結果の表示件数
+TOP_COUNT = 15
+
+PROFILE_MODES = ("cprofile", "sample", "lines")
+
+def _call_scenario(function):
+    """シナリオを実行する（出力は表示しない）。サンプリングではこのフレームより上を数えない"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function()
+
+def _frame_label(code):
+    """スタックの1段の名前（collapsed 形式で区切りに使う ';' を含まない）"""
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+def run_with_cprofile(function):
+    """
+    cProfile でシナリオを実行する
+    
+    Returns:
+        pstats.Stats: 関数ごとの呼び出し回数と時間
+    """
+    profiler = cProfile.Profile()
+    profiler.runcall(_call_scenario, function)
+    return pstats.Stats(profiler)
+
+class StackSampler:
+    """
+    別のスレッドから一定間隔で対象スレッドのスタックを記録する統計的プロファイラ
+    
+    sys._current_frames() で対象スレッドの実行中のフレームを取得し、
+    呼び出し元から順に並べたスタックごとに回数を数えます（flamegraph の collapsed 形式で出力できる）。
+    対象の処理を書き換えないため、cProfile よりも計測による遅れが小さくなります。
+    """
+    
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = {}
+        self._target = None
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def _sample(self):
+        frame = sys._current_frames().get(self._target)
+        labels = []
+        while frame is not None and frame.f_code is not _call_scenario.__code__:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        # シナリオの実行中（_call_scenario の下）のサンプルだけを数える
+        if frame is not None and labels:
+            stack = ";".join(reversed(labels))
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+    
+    def start(self, thread_id=None):
+        """サンプリングを始める（対象は省略時に呼び出したスレッド）"""
+        self._target = thread_id if thread_id is not None else threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+    
+    def collapsed(self):
+        """flamegraph.pl や speedscope で読める collapsed 形式の文字列"""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+    
+    def leaf_counts(self):
+        """スタックの末端（実際に実行していた関数）ごとのサンプル数"""
+        counts = {}
+        for stack, count in self.stacks.items():
+            leaf = stack.rsplit(";", 1)[-1]
+            counts[leaf] = counts.get(leaf, 0) + count
+        return counts
+
+def run_with_sampler(function, interval=SAMPLE_INTERVAL):
+    """
+    統計的プロファイラでシナリオを実行する
+    
+    Python はスレッドの切り替えを一定間隔でしか行わないため、
+    実行中は切り替えの間隔をサンプリングの間隔以下にします。
+    
+    Returns:
+        StackSampler: 記録したスタック
+    """
+    sampler = StackSampler(interval)
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(min(switch_interval, interval / 2))
+    sampler.start()
+    try:
+        _call_scenario(function)
+    finally:
+        sampler.stop()
+        sys.setswitchinterval(switch_interval)
+    return sampler
+
+def run_with_line_counts(function, filenames=None):
+    """
+    sys.settrace でシナリオを実行し、各行の実行回数を数える
+    
+    内側のループ（mystery_function_1 の for j in range(i, n) など）の行が何回実行されたかが分かります。
+    トレース中は実行が数十倍遅くなるため、時間の予算で入力サイズを決めるシナリオでは
+    通常より小さいサイズまでしか計測されません。
+    
+    Parameters:
+        function (callable): シナリオの関数
+        filenames (set): 数える対象のファイル（省略時はシナリオを定義したファイル）
+    
+    Returns:
+        dict: {(ファイル名, 行番号): 実行回数}
+    """
+    if filenames is None:
+        filenames = {function.__code__.co_filename}
+    hits = {}
+    
+    def trace_lines(frame, event, arg):
+        if event == "line":
+            key = (frame.f_code.co_filename, frame.f_lineno)
+            hits[key] = hits.get(key, 0) + 1
+        return trace_lines
+    
+    def trace_calls(frame, event, arg):
+        return trace_lines if frame.f_code.co_filename in filenames else None
+    
+    previous = sys.gettrace()
+    sys.settrace(trace_calls)
+    try:
+        _call_scenario(function)
+    finally:
+        sys.settrace(previous)
+    return hits
+
+def _output_path(directory, name, suffix):
+    return os.path.join(directory, f"{name}{suffix}")
+
+def profile_scenario(name, function, mode, output_dir=None, top=TOP_COUNT):
+    """
+    1つのシナリオをプロファイルし、結果を表示する（output_dir を指定するとファイルにも書き出す）
+    
+    - cprofile: 累積時間の上位の関数（.prof は pstats / snakeviz で読める）
+    - sample: 末端の関数ごとのサンプル数（.collapsed は flamegraph の collapsed 形式）
+    - lines: 実行回数の多い行（.lines.txt）
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"mode は {', '.join(PROFILE_MODES)} のいずれかです: {mode}")
+    print(f"\n===== {name}（{mode}） =====")
+    start_time = time.perf_counter()
+    
+    if mode == "cprofile":
+        stats = run_with_cprofile(function)
+        print(f"実行時間: {time.perf_counter() - start_time:.3f} 秒")
+        stats.sort_stats("cumulative").print_stats(top)
+        if output_dir:
+            path = _output_path(output_dir, name, ".prof")
+            stats.dump_stats(path)
+            print(f"'{path}' に書き出しました")
+    
+    elif mode == "sample":
+        sampler = run_with_sampler(function)
+        total = sum(sampler.stacks.values())
+        print(f"実行時間: {time.perf_counter() - start_time:.3f} 秒、サンプル数: {total}")
+        leaves = sorted(sampler.leaf_counts().items(), key=lambda item: item[1], reverse=True)
+        for leaf, count in leaves[:top]:
+            print(f"{count / total:>7.1%}  {leaf}")
+        if output_dir:
+            path = _output_path(output_dir, name, ".collapsed")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(sampler.collapsed())
+            print(f"'{path}' に書き出しました")
+    
+    else:
+        hits = run_with_line_counts(function)
+        print(f"実行時間（トレースあり）: {time.perf_counter() - start_time:.3f} 秒")
+        ranked = sorted(hits.items(), key=lambda item: item[1], reverse=True)
+        lines = [
+            f"{count:>12}  {os.path.basename(filename)}:{lineno}  {linecache.getline(filename, lineno).strip()}"
+            for (filename, lineno), count in ranked
+        ]
+        print("\n".join(lines[:top]))
+        if output_dir:
+            path = _output_path(output_dir, name, ".lines.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            print(f"'{path}' に書き出しました")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="計算量分析シナリオのプロファイル")
+    parser.add_argument("--mode", choices=PROFILE_MODES, default="sample", help="プロファイルの方法")
+    parser.add_argument("-k", "--keyword", help="シナリオ名に含まれる文字列で絞り込む")
+    parser.add_argument("--output", metavar="DIR", help="結果のファイルを書き出すディレクトリ")
+    parser.add_argument("--top", type=int, default=TOP_COUNT, help="表示する件数")
+    args = parser.parse_args(argv)
+    
+    scenarios = discover_scenarios(keyword=args.keyword)
+    if not scenarios:
+        print("対象のシナリオがありません")
+        return 1
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+    
+    for name, function in scenarios:
+        profile_scenario(name, function, args.mode, args.output, args.top)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
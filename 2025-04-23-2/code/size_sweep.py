@@ -0,0 +1,135 @@
+# size_sweep.py
+# 入力サイズを等比的に増やしながら計測し、時間の予算を超える前に打ち切る
+
+import math
+import time
+
+from benchmark_harness import benchmark
+
+# 1つの関数の計測に使う時間の予算（秒）
+DEFAULT_TIME_BUDGET = 5.0
+
+# 入力サイズの上限
+DEFAULT_MAX_N = 10 ** 8
+
+# measure_step で1つの入力サイズの計測に使う時間の目安（秒）
+# 1回の実行がこれを超える入力サイズでは、1回だけ実行して計測する
+STEP_TIME_BUDGET = 0.05
+
+# 次のステップの時間を予測するときの、増える部分の次数（両対数の傾き）の範囲
+# 配列の作成など O(n) の準備を含むことが多いため、下限は1とする
+MIN_GROWTH_EXPONENT = 1.0
+MAX_GROWTH_EXPONENT = 3.0
+
+# 傾きが求められないときに仮定する次数（安全側に二次とする）
+INITIAL_GROWTH_EXPONENT = 2.0
+
+class SweepPoint:
+    """1つの入力サイズでの計測結果"""
+    
+    def __init__(self, n, seconds, result):
+        self.n = n
+        self.seconds = seconds
+        self.result = result
+    
+    def __repr__(self):
+        return f"SweepPoint(n={self.n}, seconds={self.seconds:.6f})"
+
+def predict_seconds(points, n):
+    """
+    これまでの計測点から、サイズ n のステップにかかる時間を予測する
+    
+    各ステップの時間を「固定のコスト + n とともに増える部分」とみなします。
+    固定のコストは最も速かったステップの時間で近似し、増える部分について
+    直近2点の両対数の傾きを次数 k として t(n) = 固定 + 増加_last × (n / n_last)^k で外挿します。
+    
+    Returns:
+        float: 予測時間（秒）。計測点がない場合は None
+    """
+    if not points:
+        return None
+    
+    overhead = min(point.seconds for point in points)
+    last = points[-1]
+    growing = last.seconds - overhead
+    if growing <= 0:
+        return overhead
+    
+    exponent = INITIAL_GROWTH_EXPONENT
+    if len(points) >= 2:
+        previous = points[-2]
+        previous_growing = previous.seconds - overhead
+        if previous_growing > 0 and last.n != previous.n:
+            exponent = math.log(growing / previous_growing) / math.log(last.n / previous.n)
+    exponent = max(MIN_GROWTH_EXPONENT, min(MAX_GROWTH_EXPONENT, exponent))
+    return overhead + growing * (n / last.n) ** exponent
+
+def measure_step(func, *args):
+    """
+    adaptive_sweep の1ステップで関数の実行時間を計測する
+    
+    benchmark_harness.measure_time と同じく計測結果を記録しますが、時間の目安を STEP_TIME_BUDGET に縮めます。
+    1回の実行が目安を超える大きな入力サイズではウォームアップの1回だけを計測に使うため、
+    ステップの時間は関数の1回の実行時間とほぼ同じになり、予算の範囲で大きなサイズまで計測できます。
+    
+    Returns:
+        tuple: (関数の戻り値, 1回あたりの実行時間の最小値（秒）)
+    """
+    result = benchmark(func, args, time_budget=STEP_TIME_BUDGET)
+    return result.result, result.min_seconds
+
+def adaptive_sweep(run, time_budget=DEFAULT_TIME_BUDGET, start_n=10, growth=2.0, max_n=DEFAULT_MAX_N):
+    """
+    入力サイズを等比的に増やしながら run(n) を実行する
+    
+    次のステップの時間を予測し、残りの予算に収まらない場合はそこで打ち切ります。
+    遅いアルゴリズムは少ない点で止まり、速いアルゴリズムは max_n まで計測されます。
+    
+    Parameters:
+        run (callable): 入力サイズ n を受け取って1ステップ分の計測を行う関数（準備も含めて時間を数える）。
+                        計測には measure_step を使う（measure_time はウォームアップと繰り返しで
+                        1ステップが関数の実行時間の数倍になり、早く打ち切られる）
+        time_budget (float): 全体で使ってよい時間（秒）
+        start_n (int): 最初の入力サイズ
+        growth (float): 次の入力サイズへの倍率（1より大きい値）
+        max_n (int): 入力サイズの上限
+    
+    Returns:
+        list: SweepPoint のリスト
+    """
+    if growth <= 1:
+        raise ValueError("growth は1より大きい値を指定してください")
+    
+    points = []
+    spent = 0.0
+    n = start_n
+    while n <= max_n:
+        predicted = predict_seconds(points, n)
+        if predicted is not None and spent + predicted > time_budget:
+            break
+        
+        start_time = time.perf_counter()
+        result = run(n)
+        elapsed = time.perf_counter() - start_time
+        
+        points.append(SweepPoint(n, elapsed, result))
+        spent += elapsed
+        n = max(n + 1, int(n * growth))
+    
+    return points
+
+def sweep_sizes(points):
+    """計測点の入力サイズのリスト"""
+    return [point.n for point in points]
+
+if __name__ == "__main__":
+    def linear(n):
+        return sum(range(n))
+    
+    def quadratic(n):
+        return sum(i * j for i in range(n) for j in range(n))
+    
+    for name, function in [("O(n)", linear), ("O(n²)", quadratic)]:
+        points = adaptive_sweep(function, time_budget=2.0)
+        total = sum(point.seconds for point in points)
+        print(f"{name}: {len(points)} 点、最大サイズ {points[-1].n}、合計 {total:.3f} 秒")
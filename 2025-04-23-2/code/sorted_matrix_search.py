@@ -0,0 +1,217 @@
+# sorted_matrix_search.py
+# ソート済み行列での複数の値の一括探索
+# 他の日のフォルダのモジュールを読み込むため、リポジトリのルートから python run.py 2025-04-23-2/code/sorted_matrix_search.py で実行する
+
+import array
+import bisect
+import math
+
+from lazy_import import is_loaded, lazy_module
+from mystery_function_analysis import create_sorted_matrix, search_sorted_matrix
+
+# NumPy は最初に使うときに読み込む（ない環境では None になり、list の行列だけを扱う）
+np = lazy_module("numpy")
+
+def _probe_count(width):
+    """幅 width の範囲を二分探索するときの比較回数（最大値）"""
+    return max(1, math.ceil(math.log2(width + 1)))
+
+def choose_method(rows, cols):
+    """
+    行列の形から探索方法を選ぶ
+    
+    - 階段探索: O(n + m)
+    - 行ごとの二分探索: O(n log m)
+    横に長い行列（m が n log m より十分大きい）では行ごとの二分探索の方が速い。
+    
+    Returns:
+        str: "staircase" または "rowwise"
+    """
+    if rows == 0 or cols == 0:
+        return "staircase"
+    return "rowwise" if rows * _probe_count(cols) < rows + cols else "staircase"
+
+def _staircase_batch(matrix, targets, order, hits, operations):
+    """
+    昇順に並べたクエリを階段探索で処理する（list の行列向け）
+    
+    探索値が大きくなるほど、以下の行・列は二度と候補にならないため、
+    その境界（top, left）を前のクエリから引き継いで探索範囲を狭める。
+    - 末尾の値が探索値より小さい行（top より上）
+    - 最下行の値が探索値より小さい列（left より左）
+    """
+    rows = len(matrix)
+    cols = len(matrix[0])
+    last_row = matrix[rows - 1]
+    top, left = 0, 0
+    
+    for k in order:
+        target = targets[k]
+        ops = 0
+        
+        # 共有している境界を進める（全クエリを通して最大 n + m 回）
+        while top < rows and matrix[top][cols - 1] < target:
+            top += 1
+            ops += 1
+        while left < cols and last_row[left] < target:
+            left += 1
+            ops += 1
+        
+        # 残った部分行列を右上から階段探索する
+        row, col = top, cols - 1
+        found = False
+        while row < rows and col >= left:
+            ops += 1  # 比較操作
+            value = matrix[row][col]
+            if value == target:
+                found = True
+                break
+            elif value > target:
+                col -= 1
+            else:
+                row += 1
+        
+        hits[k] = found
+        operations[k] = ops
+
+def _rowwise_batch(matrix, targets, order, hits, operations):
+    """
+    昇順に並べたクエリを行ごとの二分探索で処理する（list の行列向け）
+    
+    探索値 t を含みうるのは「末尾の値 >= t」かつ「先頭の値 <= t」の行だけなので、
+    その範囲を先頭列・末尾列の二分探索で求めてから、各行を二分探索する。
+    """
+    cols = len(matrix[0])
+    first_column = [row[0] for row in matrix]
+    last_column = [row[cols - 1] for row in matrix]
+    probes = _probe_count(cols)
+    
+    for k in order:
+        target = targets[k]
+        row_lo = bisect.bisect_left(last_column, target)
+        row_hi = bisect.bisect_right(first_column, target)
+        ops = 2 * _probe_count(len(matrix))
+        found = False
+        
+        for r in range(row_lo, row_hi):
+            ops += probes
+            row = matrix[r]
+            col = bisect.bisect_left(row, target)
+            if col < cols and row[col] == target:
+                found = True
+                break
+        
+        hits[k] = found
+        operations[k] = ops
+
+def _numpy_batch(matrix, targets):
+    """
+    NumPy の2次元配列に対して、行ごとの二分探索をクエリ全体でまとめて行う
+    
+    クエリを昇順に並べると、各行を探索する必要があるクエリは連続した範囲になるため、
+    行ごとに np.searchsorted を1回呼ぶだけで済む。
+    """
+    rows, cols = matrix.shape
+    queries = np.asarray(targets)
+    order = np.argsort(queries, kind="stable")
+    sorted_queries = queries[order]
+    
+    hits = np.zeros(len(queries), dtype=bool)
+    operations = np.full(len(queries), 2 * _probe_count(rows), dtype=np.int64)
+    if rows == 0 or cols == 0 or len(queries) == 0:
+        return hits, operations
+    
+    # 各クエリが候補とする行の範囲 [row_lo, row_hi)（どちらもクエリの昇順で単調増加）
+    row_lo = np.searchsorted(matrix[:, -1], sorted_queries, side="left")
+    row_hi = np.searchsorted(matrix[:, 0], sorted_queries, side="right")
+    
+    sorted_hits = np.zeros(len(queries), dtype=bool)
+    probes = _probe_count(cols)
+    for r in range(rows):
+        # 行 r を探索するクエリ: row_lo <= r かつ r < row_hi
+        begin = np.searchsorted(row_hi, r, side="right")
+        end = np.searchsorted(row_lo, r, side="right")
+        if begin >= end:
+            continue
+        window = slice(begin, end)
+        active = ~sorted_hits[window]
+        row = matrix[r]
+        positions = np.searchsorted(row, sorted_queries[window])
+        found = row[np.minimum(positions, cols - 1)] == sorted_queries[window]
+        operations[order[window][active]] += probes
+        sorted_hits[window] |= found
+    
+    hits[order] = sorted_hits
+    return hits, operations
+
+def batch_search_sorted_matrix(matrix, targets, method="auto"):
+    """
+    ソート済み行列で複数の値をまとめて探索する
+    
+    Parameters:
+        matrix: 各行が左から右へ、各列が上から下へ増加する行列（list のリスト、または NumPy の2次元配列）
+        targets: 探索する値の並び
+        method (str): "auto"（行列の形から選択）、"staircase"、"rowwise"
+    
+    Returns:
+        tuple: (見つかったかどうか, 操作回数)
+               list の行列では array.array('B') と array.array('q')、
+               NumPy 配列では bool と int64 の NumPy 配列（いずれも targets と同じ順序）
+    """
+    if method not in ("auto", "staircase", "rowwise"):
+        raise ValueError(f"method は 'auto'、'staircase'、'rowwise' のいずれかです: {method}")
+    
+    if is_loaded(np) and isinstance(matrix, np.ndarray):
+        # NumPy 配列では常に行ごとの二分探索をまとめて行う
+        return _numpy_batch(matrix, targets)
+    
+    hits = array.array("B", bytes(len(targets)))
+    operations = array.array("q", bytes(8 * len(targets)))
+    rows = len(matrix)
+    cols = len(matrix[0]) if rows > 0 else 0
+    if rows == 0 or cols == 0:
+        return hits, operations
+    
+    if method == "auto":
+        method = choose_method(rows, cols)
+    
+    order = sorted(range(len(targets)), key=targets.__getitem__)
+    if method == "rowwise":
+        _rowwise_batch(matrix, targets, order, hits, operations)
+    else:
+        _staircase_batch(matrix, targets, order, hits, operations)
+    return hits, operations
+
+def batch_search_demo():
+    import random
+    import time
+    
+    size = 300
+    matrix = create_sorted_matrix(size)
+    targets = [random.randint(1, size * size + 100) for _ in range(20000)]
+    print(f"行列サイズ: {size}x{size}、クエリ数: {len(targets)}")
+    
+    start_time = time.perf_counter()
+    expected = [search_sorted_matrix(matrix, target)[0] for target in targets]
+    single_time = time.perf_counter() - start_time
+    print(f"1件ずつの階段探索: {single_time:.4f} 秒")
+    
+    for method in ("staircase", "rowwise"):
+        start_time = time.perf_counter()
+        hits, operations = batch_search_sorted_matrix(matrix, targets, method)
+        batch_time = time.perf_counter() - start_time
+        assert [bool(hit) for hit in hits] == expected
+        print(f"一括探索（{method}）: {batch_time:.4f} 秒、平均操作回数 {sum(operations) / len(targets):.1f}")
+    
+    if np is not None:
+        start_time = time.perf_counter()
+        hits, operations = batch_search_sorted_matrix(np.array(matrix), targets)
+        numpy_time = time.perf_counter() - start_time
+        assert hits.tolist() == expected
+        print(f"一括探索（NumPy）: {numpy_time:.4f} 秒、平均操作回数 {operations.mean():.1f}")
+    
+    print(f"\n正方行列（{size}x{size}）で選ばれる方法: {choose_method(size, size)}")
+    print(f"横に長い行列（4x100000）で選ばれる方法: {choose_method(4, 100000)}")
+
+if __name__ == "__main__":
+    batch_search_demo()
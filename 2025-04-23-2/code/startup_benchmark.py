@@ -0,0 +1,166 @@
+# startup_benchmark.py
+# 各スクリプトの起動時間（import にかかる時間）を -X importtime で計測し、遅くなっていないか確かめる
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+
+# リポジトリのルート（各日付のフォルダの code/*.py を計測する）
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+# 起動時に読み込まないモジュール（lazy_import.lazy_module や関数の中の import で、最初に使うときに読み込む）
+HEAVY_MODULES = ("numpy", "matplotlib")
+
+# NumPy での探索そのものが目的のスクリプト（起動時に NumPy を読み込んでよい）
+EAGER_SCRIPTS = {"mmap_search", "parallel_search", "vectorized_search"}
+
+# EAGER_SCRIPTS が起動時に読み込んでよいモジュール
+EAGER_MODULES = ("numpy",)
+
+# 1つのスクリプトの import にかかる時間の上限（ミリ秒）
+STARTUP_BUDGET_MS = 150.0
+
+# EAGER_SCRIPTS の import にかかる時間の上限（ミリ秒）。NumPy の読み込み（100 ms 前後）を含む
+EAGER_STARTUP_BUDGET_MS = 300.0
+
+# 計測の回数（最小値を使う）
+REPEAT = 3
+
+class StartupResult:
+    """1つのスクリプトの起動時間の計測結果"""
+    
+    def __init__(self, path, module, import_ms, heavy_modules):
+        self.path = path
+        self.module = module
+        self.import_ms = import_ms
+        self.heavy_modules = heavy_modules
+    
+    def to_dict(self):
+        return {
+            "path": os.path.relpath(self.path, REPO_ROOT),
+            "module": self.module,
+            "import_ms": self.import_ms,
+            "heavy_modules": self.heavy_modules,
+        }
+    
+    def __repr__(self):
+        return f"StartupResult({self.module!r}, import={self.import_ms:.1f}ms, heavy={self.heavy_modules})"
+
+def entry_points(root=REPO_ROOT):
+    """計測するスクリプトのパス（各日付のフォルダの code/*.py）"""
+    return sorted(glob.glob(os.path.join(root, "*", "code", "*.py")))
+
+def parse_importtime(output):
+    """
+    -X importtime の出力を読み取る
+    
+    各行は "import time: 自身の時間 | 累計の時間 | モジュール名" の形式で、
+    モジュール名の前の空白の数が import の深さを表します。
+    
+    Returns:
+        list: (モジュール名, 深さ, 累計の時間（マイクロ秒）) のリスト
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # 見出しの行
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), depth, int(parts[1])))
+    return entries
+
+def measure_startup(path, repeat=REPEAT):
+    """
+    スクリプトを新しいプロセスで import し、import にかかる時間を計測する
+    
+    スクリプトのフォルダをカレントディレクトリにして import するため、
+    __main__ の部分は実行されません。他の日のモジュールは、run.py が設定した PYTHONPATH から読み込みます。
+    
+    Returns:
+        StartupResult: 計測結果（時間は repeat 回の最小値）
+    """
+    directory, filename = os.path.split(path)
+    module = os.path.splitext(filename)[0]
+    best_us = None
+    heavy = set()
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=directory, capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            message = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else ""
+            raise RuntimeError(f"{module} の import に失敗しました: {message}")
+        entries = parse_importtime(completed.stderr)
+        total = next(cumulative for name, depth, cumulative in entries if name == module and depth == 0)
+        best_us = total if best_us is None else min(best_us, total)
+        heavy.update(name.split(".")[0] for name, _, _ in entries if name.split(".")[0] in HEAVY_MODULES)
+    return StartupResult(path, module, best_us / 1000, sorted(heavy))
+
+def check_startup(result, budget_ms=STARTUP_BUDGET_MS, eager_budget_ms=EAGER_STARTUP_BUDGET_MS):
+    """
+    起動時間の条件を満たしているかを確認する
+    
+    EAGER_SCRIPTS は NumPy の読み込みを含む eager_budget_ms を上限とし、
+    EAGER_MODULES 以外の重いモジュール（matplotlib など）を読み込んでいないかを確認します。
+    
+    Returns:
+        list: 満たしていない条件の説明（問題がなければ空のリスト）
+    """
+    problems = []
+    heavy_modules = result.heavy_modules
+    if result.module in EAGER_SCRIPTS:
+        budget_ms = eager_budget_ms
+        heavy_modules = [name for name in heavy_modules if name not in EAGER_MODULES]
+    if result.import_ms > budget_ms:
+        problems.append(f"import に {result.import_ms:.1f} ms（上限 {budget_ms:.0f} ms）")
+    if heavy_modules:
+        problems.append(f"起動時に {', '.join(heavy_modules)} を読み込んでいます")
+    return problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="各スクリプトの起動時間（import にかかる時間）の計測")
+    parser.add_argument("-k", "--keyword", help="スクリプトのパスに含まれる文字列で絞り込む")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="計測の回数（最小値を使う）")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS, help="import にかかる時間の上限（ミリ秒）")
+    parser.add_argument("--eager-budget-ms", type=float, default=EAGER_STARTUP_BUDGET_MS,
+                        help="起動時に NumPy を読み込むスクリプトの import にかかる時間の上限（ミリ秒）")
+    parser.add_argument("--json", help="計測結果を書き出す JSON ファイルのパス")
+    args = parser.parse_args(argv)
+    
+    paths = [path for path in entry_points() if not args.keyword or args.keyword in path]
+    if not paths:
+        print("対象のスクリプトがありません")
+        return 1
+    
+    results = []
+    failures = 0
+    for path in paths:
+        result = measure_startup(path, args.repeat)
+        results.append(result)
+        problems = check_startup(result, args.budget_ms, args.eager_budget_ms)
+        failures += bool(problems)
+        heavy = f"（{', '.join(result.heavy_modules)}）" if result.heavy_modules else ""
+        status = "NG: " + "、".join(problems) if problems else "OK"
+        print(f"{os.path.relpath(path, REPO_ROOT):<50} {result.import_ms:>8.1f} ms{heavy}  {status}")
+    
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "budget_ms": args.budget_ms,
+                "eager_budget_ms": args.eager_budget_ms,
+                "results": [result.to_dict() for result in results],
+            }, f, ensure_ascii=False, indent=2)
+        print(f"計測結果を '{args.json}' に書き出しました")
+    
+    print(f"\n{len(results)} 件中 {failures} 件が条件を満たしていません")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
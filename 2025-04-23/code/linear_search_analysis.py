@@ -1,9 +1,17 @@
 # linear_search_analysis.py
 # 線形探索アルゴリズムの計算量分析（シンプル版）
+# 他の日のフォルダのモジュールを読み込むため、リポジトリのルートから python run.py 2025-04-23/code/linear_search_analysis.py で実行する
 
+import argparse
 import time
 import random
 
+from complexity_fitter import print_complexity_fit
+from measured_plot import plot_measured_series
+from op_counter import count_operations
+
+import linear_search as plain_linear_search
+
 # 線形探索の基本実装
 def linear_search(arr, target):
     """
@@ -140,6 +148,8 @@ def test_size_impact():
     
     # テストする配列サイズ
     sizes = [10, 100, 1000, 10000]
+    best_counts = []
+    worst_counts = []
     
     # 各サイズでテスト
     for size in sizes:
@@ -167,9 +177,41 @@ def test_size_impact():
         not_found_target = size + 5
         _, not_found_comparisons = linear_search(arr, not_found_target)
         print(f"  存在しない要素: {not_found_comparisons} 回の比較")
+        
+        best_counts.append(best_comparisons)
+        worst_counts.append(not_found_comparisons)
+    
+    # 比較回数から計算量のクラスを推定する
+    print()
+    print_complexity_fit(sizes, best_counts, "最良のケースの推定計算量", expected="O(1)")
+    print_complexity_fit(sizes, worst_counts, "最悪のケースの推定計算量", expected="O(n)")
+    
+    # グラフに重ねるための系列
+    return {"最良のケース": (sizes, best_counts), "最悪のケース": (sizes, worst_counts)}
+
+# ========== カウンターのない実装の比較回数 ==========
+def test_counted_without_counter():
+    print("\n===== カウンターのない実装の比較回数（計測用の代理オブジェクト） =====")
+    
+    sizes = [10, 100, 1000, 10000]
+    
+    for size in sizes:
+        arr = list(range(size))
+        
+        # このファイルの linear_search（比較回数を自分で数える）
+        _, comparisons = linear_search(arr, size + 5)
+        
+        # 2025-04-21 の linear_search（カウンターなし）の比較回数を外から数える
+        _, counts = count_operations(plain_linear_search.linear_search, arr, size + 5)
+        
+        print(f"配列サイズ {size}: カウンター {comparisons} 回、代理オブジェクト {counts.comparisons} 回")
 
 # メイン実行部分
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="線形探索アルゴリズムの計算量分析")
+    parser.add_argument("--plot", help="比較回数と当てはめた計算量のグラフを書き出すファイルのパス")
+    args = parser.parse_args()
+    
     print("線形探索アルゴリズムの計算量分析を開始します...")
     
     # 各ケースのテスト
@@ -179,6 +221,11 @@ if __name__ == "__main__":
     test_not_found_case()
     
     # 配列サイズによる影響のテスト
-    test_size_impact()
+    size_series = test_size_impact()
+    test_counted_without_counter()
+    
+    if args.plot:
+        plot_measured_series(size_series, args.plot, title="配列サイズと比較回数", ylabel="比較回数")
+        print(f"グラフが '{args.plot}' として保存されました")
     
     print("\n分析が完了しました。")
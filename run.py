@@ -0,0 +1,52 @@
+# run.py
+# 各日付のフォルダのスクリプトを、他の日のモジュール（共通の計測ツールなど）を読み込める状態で実行する
+
+import glob
+import os
+import runpy
+import sys
+
+# リポジトリのルート
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+USAGE = "使い方: python run.py <スクリプトのパス> [スクリプトの引数...]（例: python run.py 2025-04-22/code/big_o_examples.py --json result.json）"
+
+def code_directories(root=REPO_ROOT):
+    """モジュールを探すディレクトリ（各日付のフォルダの code）"""
+    return sorted(glob.glob(os.path.join(root, "*", "code")))
+
+def configure_path(root=REPO_ROOT):
+    """
+    各日付のフォルダの code を import の検索パスに加える
+    
+    子プロセス（startup_benchmark の計測など）でも同じモジュールを読み込めるように、
+    環境変数 PYTHONPATH にも加えます。
+    """
+    directories = code_directories(root)
+    for directory in directories:
+        if directory not in sys.path:
+            sys.path.append(directory)
+    
+    existing = [path for path in os.environ.get("PYTHONPATH", "").split(os.pathsep) if path]
+    os.environ["PYTHONPATH"] = os.pathsep.join(existing + [d for d in directories if d not in existing])
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(USAGE)
+        return 0 if argv else 2
+    
+    path = os.path.abspath(argv[0])
+    if not os.path.isfile(path):
+        print(f"スクリプトが見つかりません: {argv[0]}")
+        return 2
+    
+    configure_path()
+    # python <スクリプト> で実行した場合と同じく、スクリプトのフォルダを検索パスの先頭にし、引数を渡す
+    sys.path.insert(0, os.path.dirname(path))
+    sys.argv = [path] + argv[1:]
+    runpy.run_path(path, run_name="__main__")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())